@@ -0,0 +1,160 @@
+# admission.py
+"""In-process admission control for login and OTP requests.
+
+Every login, send_otp and OTP guess first has to take a token from a
+bucket for the email it targets and one for the client it comes from, and
+(for logins) a slot under a global concurrency cap. Anything over the limit is rejected
+immediately with a retry-after hint, before touching the user store or the
+password hashing pool, so a credential-stuffing burst cannot queue up
+unbounded work.
+
+Bucket tables are LRU-bounded (ADMISSION_MAX_KEYS per table): idle keys are
+evicted first, so memory stays fixed however many emails or clients an
+attacker cycles through.
+
+    LOGIN_EMAIL_RATE / LOGIN_EMAIL_BURST     per-email logins (per minute / burst)
+    LOGIN_CLIENT_RATE / LOGIN_CLIENT_BURST   per-client logins
+    OTP_EMAIL_RATE / OTP_EMAIL_BURST         per-email OTP mails
+    OTP_CLIENT_RATE / OTP_CLIENT_BURST       per-client OTP mails
+    OTP_VERIFY_EMAIL_RATE / _BURST           per-email OTP guesses
+    OTP_VERIFY_CLIENT_RATE / _BURST          per-client OTP guesses
+    LOGIN_MAX_CONCURRENT                     logins in flight per process
+    TRUSTED_PROXIES                          comma-separated proxy IPs / CIDRs whose
+                                             X-Forwarded-For is believed (default none)
+
+A client is the address its connection comes from. Behind a reverse proxy,
+list the proxy in TRUSTED_PROXIES (e.g. 127.0.0.1 for one on the same host)
+and the client is taken from X-Forwarded-For instead; see client_address.
+"""
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+MAX_KEYS = int(os.environ.get("ADMISSION_MAX_KEYS", "100000"))
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(net.strip(), strict=False)
+    for net in os.environ.get("TRUSTED_PROXIES", "").split(",") if net.strip()
+]
+
+
+class Throttled(Exception):
+    """Request rejected by admission control; retry_after is in seconds."""
+
+    def __init__(self, retry_after):
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"Too many attempts. Try again in {self.retry_after} s.")
+
+
+class TokenBuckets:
+    """One token bucket per key, in an LRU table of at most max_keys entries."""
+
+    def __init__(self, per_minute, burst, max_keys=MAX_KEYS):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst)
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, last refill time)
+        self._lock = threading.Lock()
+
+    def take(self, key):
+        """Take one token for key. Returns 0 if admitted, else seconds until a token is free."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def refund(self, key):
+        """Give a token back, e.g. when a later check rejected the request."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, last = self._buckets[key]
+                self._buckets[key] = (min(self.burst, tokens + 1), last)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+def _buckets(prefix, rate, burst):
+    return TokenBuckets(float(os.environ.get(f"{prefix}_RATE", rate)), float(os.environ.get(f"{prefix}_BURST", burst)))
+
+
+LIMITS = {
+    "login": (_buckets("LOGIN_EMAIL", 5, 5), _buckets("LOGIN_CLIENT", 30, 20)),
+    "otp": (_buckets("OTP_EMAIL", 0.5, 3), _buckets("OTP_CLIENT", 3, 5)),
+    # ~15 guesses per email over a 10 minute OTP: about 1 in 60000 to hit a 6-digit code
+    "otp_verify": (_buckets("OTP_VERIFY_EMAIL", 1, 5), _buckets("OTP_VERIFY_CLIENT", 10, 10)),
+}
+_in_flight = threading.BoundedSemaphore(int(os.environ.get("LOGIN_MAX_CONCURRENT", "8")))
+
+
+def _trusted(address):
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in net for net in TRUSTED_PROXIES)
+
+
+def client_address(peer, forwarded=None):
+    """Address to rate-limit by, from the connection's peer and its X-Forwarded-For header.
+
+    The header is believed only when the peer is a trusted proxy, and only back
+    to the last trusted hop: every proxy appends the address it saw, so the
+    right-most hop not in TRUSTED_PROXIES was added by one of ours. Anything
+    left of it is whatever the client chose to send. A peer of None (Streamlit
+    reports loopback that way) counts as 127.0.0.1.
+    """
+    if not forwarded or not _trusted(peer or "127.0.0.1"):
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def check(action, email, client=None):
+    """Raise Throttled unless `action` ("login", "otp" or "otp_verify") is allowed for this email and client."""
+    by_email, by_client = LIMITS[action]
+    wait = by_email.take(email.strip().lower())
+    if wait:
+        raise Throttled(wait)
+    if client is not None:
+        wait = by_client.take(client)
+        if wait:
+            by_email.refund(email.strip().lower())
+            raise Throttled(wait)
+
+
+def refund(action, email, client=None):
+    """Give back the tokens a successful check() took, when a later step rejected the request."""
+    by_email, by_client = LIMITS[action]
+    by_email.refund(email.strip().lower())
+    if client is not None:
+        by_client.refund(client)
+
+
+@contextmanager
+def admit_login(email, client=None):
+    """Rate-limit a login and hold one of the global in-flight slots while it runs."""
+    check("login", email, client)
+    if not _in_flight.acquire(blocking=False):
+        # Rejected for server load, not for anything this email or client did
+        refund("login", email, client)
+        raise Throttled(1)
+    try:
+        yield
+    finally:
+        _in_flight.release()
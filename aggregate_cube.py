@@ -0,0 +1,182 @@
+# aggregate_cube.py
+"""Materialized (region, income group, period) x metric aggregate cube.
+
+ingest.py builds the cube right after the dataset and stores it next to it
+(data/cube.arrow). Every row is one cell: region and income group (each
+either a concrete value or "All"), a period that is either a year or a
+decade, the total population and the population-weighted mean of every
+inequality metric over the country-years in the cell.
+
+Dashboard queries at any of those grains are a dict lookup. Anything the
+cube cannot answer (a cube built from an older dataset, or a missing
+cell) is computed from the detail rows instead, so callers never have to
+care which path served them.
+"""
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import inequality_metrics
+from income_store import DATA_DIR, get_income_store
+
+CUBE_FILE = "cube.arrow"
+ALL = "All"
+UNKNOWN = "Unknown"
+PERIODS = ("year", "decade")
+
+
+def _population_weights(table):
+    population = table.column("population").to_numpy(zero_copy_only=False).astype(float)
+    # Countries without population figures count as weight 1 rather than vanishing
+    return np.where(np.isnan(population), 1.0, population)
+
+
+def build_cube(table, group_columns, version):
+    """Aggregate the detail table into cube cells. Returns a pyarrow Table."""
+    matrix = np.column_stack([table.column(c).to_numpy(zero_copy_only=False) for c in group_columns])
+    metrics = inequality_metrics.all_metrics(matrix)
+    weights = _population_weights(table)
+    years = table.column("year").to_numpy(zero_copy_only=False)
+
+    base = {
+        "region": pc.fill_null(table.column("region"), UNKNOWN),
+        "income_group": pc.fill_null(table.column("income_group"), UNKNOWN),
+        "weight": pa.array(weights),
+    }
+    for name in inequality_metrics.METRICS:
+        values = metrics[name]
+        finite = np.isfinite(values)
+        base[f"w_{name}"] = pa.array(np.where(finite, values * weights, 0.0))
+        base[f"n_{name}"] = pa.array(np.where(finite, weights, 0.0))
+
+    sums = [(c, "sum") for c in base if c not in ("region", "income_group")]
+    cells = []
+    for period in PERIODS:
+        detail = pa.table({**base, "period": pa.array(years if period == "year" else years // 10 * 10)})
+        for keys in (["region", "income_group"], ["region"], ["income_group"], []):
+            grouped = detail.group_by(keys + ["period"]).aggregate(sums)
+            n = grouped.num_rows
+            cell = {
+                "region": grouped.column("region") if "region" in keys else pa.array([ALL] * n),
+                "income_group": grouped.column("income_group") if "income_group" in keys else pa.array([ALL] * n),
+                "period_type": pa.array([period] * n),
+                "period": grouped.column("period").cast(pa.int32()),
+                "population": grouped.column("weight_sum"),
+            }
+            for name in inequality_metrics.METRICS:
+                w = grouped.column(f"w_{name}_sum").to_numpy()
+                d = grouped.column(f"n_{name}_sum").to_numpy()
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    cell[name] = pa.array(np.where(d > 0, w / d, np.nan))
+            cells.append(pa.table(cell))
+    cube = pa.concat_tables(cells)
+    return cube.replace_schema_metadata({"version": version})
+
+
+def write_cube(cube, out_path):
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as f, pa.ipc.new_file(f, cube.schema) as writer:
+        writer.write_table(cube)
+    os.replace(tmp, out_path)
+
+
+class AggregateCube:
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        cube = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        self.version = cube.schema.metadata[b"version"].decode()
+        self.metrics = {name: cube.column(name).to_numpy() for name in inequality_metrics.METRICS}
+        self.metrics["population"] = cube.column("population").to_numpy()
+        keys = zip(*(cube.column(c).to_pylist() for c in ("region", "income_group", "period_type", "period")))
+        self.index = {key: i for i, key in enumerate(keys)}
+
+    def lookup(self, metric, region, income_group, period_type, period):
+        i = self.index.get((region, income_group, period_type, period))
+        return None if i is None else float(self.metrics[metric][i])
+
+
+_cube = None
+_cube_lock = threading.Lock()
+
+
+def get_cube():
+    """The process-wide cube if it matches the current dataset version, else None."""
+    global _cube
+    store = get_income_store()
+    path = os.path.join(DATA_DIR, CUBE_FILE)
+    with _cube_lock:
+        if store is None or not os.path.exists(path):
+            _cube = None
+        elif _cube is None or _cube.mtime != os.path.getmtime(path):
+            _cube = AggregateCube(path)
+        if _cube is not None and _cube.version != store.version:
+            return None
+        return _cube
+
+
+def _compute(metric, region, income_group, period_type, period):
+    """Fallback: aggregate the same cell straight from the detail rows."""
+    store = get_income_store()
+    if store is None:
+        return None
+    if period_type == "year":
+        rows = store.rows(year_from=period, year_to=period)
+    else:
+        rows = store.rows(year_from=period, year_to=period + 9)
+    mask = np.ones(rows.num_rows, dtype=bool)
+    for column, wanted in (("region", region), ("income_group", income_group)):
+        if wanted != ALL:
+            values = pc.fill_null(rows.column(column), UNKNOWN)
+            mask &= pc.equal(values, wanted).to_numpy(zero_copy_only=False)
+    rows = rows.filter(pa.array(mask))
+    if rows.num_rows == 0:
+        return None
+    weights = _population_weights(rows)
+    if metric == "population":
+        return float(weights.sum())
+    values = inequality_metrics.all_metrics(store.group_matrix(rows))[metric]
+    finite = np.isfinite(values)
+    if not finite.any():
+        return None
+    return float(np.average(values[finite], weights=weights[finite]))
+
+
+def query(metric, region=ALL, income_group=ALL, year=None, decade=None):
+    """Population-weighted `metric` for one cell; served from the cube when possible."""
+    period_type, period = ("decade", decade // 10 * 10) if decade is not None else ("year", year)
+    cube = get_cube()
+    if cube is not None:
+        value = cube.lookup(metric, region, income_group, period_type, period)
+        if value is not None:
+            return value
+    return _compute(metric, region, income_group, period_type, period)
+
+
+def dimension_values(dimension):
+    """Distinct values of "region" or "income_group" in the current dataset."""
+    store = get_income_store()
+    if store is None:
+        return []
+    return sorted(pc.unique(pc.fill_null(store.table.column(dimension), UNKNOWN)).to_pylist())
+
+
+def year_range():
+    """(first, last) year in the current dataset."""
+    bounds = pc.min_max(get_income_store().table.column("year")).as_py()
+    return bounds["min"], bounds["max"]
+
+
+def series(metric, periods, region=ALL, income_group=ALL, period_type="year"):
+    """query() over a list of years (or decades). Missing cells come back as NaN."""
+    values = []
+    for period in periods:
+        if period_type == "decade":
+            value = query(metric, region, income_group, decade=period)
+        else:
+            value = query(metric, region, income_group, year=period)
+        values.append(np.nan if value is None else value)
+    return np.array(values)
@@ -1,16 +1,33 @@
 import streamlit as st
-from auth_module import signup, login, send_otp
-from streamlit_lottie import st_lottie
-import requests
+from auth_module import (
+    signup, login, send_otp, reset_password_with_otp,
+    start_session, session_user, end_session, begin_reset, pending_reset, end_reset,
+)
+from admission import client_address
+from session_store import SESSION_TTL
+from lottie_cache import warm_up
+from assets import image_source
+from stylesheets import inject_stylesheet, inject_theme_stylesheet
+from telemetry import begin_rerun, rerun_spans, serve_metrics, snapshot, span, ENABLED as METRICS_ENABLED
+import views
+from views.home import HOME_LOTTIE_URL
 import os
-
-def centered_layout(content_func):
-    """Reusable wrapper to center page content"""
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        content_func()
+import time
 
 st.set_page_config(page_title="Animated Login System", layout="wide")
+SESSION_COOKIE = "session"
+def write_session_cookie(token, max_age):
+    """Set the login cookie in the browser (max_age=0 clears it).
+
+    The token stays out of the URL, so history, shared links and Referer headers never carry it.
+    Streamlit cannot send Set-Cookie from a script, so the cookie is written by JS and is not
+    HttpOnly; SameSite=Strict keeps it off cross-site requests.
+    """
+    st.html(
+        f"<script>document.cookie = '{SESSION_COOKIE}={token}; Path=/; Max-Age={max_age}; SameSite=Strict'"
+        " + (location.protocol === 'https:' ? '; Secure' : '');</script>",
+        unsafe_allow_javascript=True,
+    )
 # ---------------- SESSION STATE ----------------
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -18,87 +35,77 @@ if "mode" not in st.session_state:
     st.session_state.mode = "Login"
 if "page" not in st.session_state:
     st.session_state.page = "Home"
-# OTP and reset_email are internal (not used as widget keys)
-if "otp" not in st.session_state:
-    st.session_state.otp = ""
+# reset_email is internal (not used as a widget key); the OTP itself only lives in the shared store
 if "reset_email" not in st.session_state:
     st.session_state.reset_email = ""
+if "otp_delivery" not in st.session_state:
+    st.session_state.otp_delivery = None
 if "theme" not in st.session_state:
     st.session_state.theme = "System (Default)"
+# (token, max_age) for the session cookie, written once the next full run finishes
+if "session_cookie" not in st.session_state:
+    st.session_state.session_cookie = None
+if "session_token" not in st.session_state:
+    # New websocket session, possibly on another replica: resume where this browser left off.
+    # Only ids the shared store issued are honoured; anything else is ignored.
+    st.session_state.session_token = None
+    st.session_state.reset_id = None
+    token = st.context.cookies.get(SESSION_COOKIE)
+    reset_id = st.query_params.get("reset")
+    if session_user(token):
+        st.session_state.session_token = token
+        st.session_state.logged_in = True
+    elif pending_reset(reset_id):
+        st.session_state.reset_id = reset_id
+        st.session_state.reset_email = pending_reset(reset_id)
+        st.session_state.mode = "OTPVerification"
 # ---------------- Lottie Loader ----------------
-def load_lottieurl(url: str):
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            st.warning(f"Lottie URL failed: {url}")
-            return {}
-        return r.json()
-    except Exception as e:
-        st.warning(f"Error loading Lottie animation: {e}")
-        return {}
+# Fetch animations in the background as soon as the process starts (set LOTTIE_WARMUP=0 to skip)
+if os.environ.get("LOTTIE_WARMUP", "1") == "1":
+    warm_up([HOME_LOTTIE_URL])
+
+def client_id():
+    """Best-effort identity of the browser's client, for per-client rate limits"""
+    # X-Forwarded-For counts only from proxies listed in TRUSTED_PROXIES (admission.py)
+    return client_address(st.context.ip_address, st.context.headers.get("X-Forwarded-For"))
 # Helpers for Forgot Password
-def verify_otp(entered_otp: str) -> bool:
-    return entered_otp == st.session_state.otp
-def reset_password(email: str, new_password: str) -> bool:
-    return update_password(email, new_password)
+def reset_password(email: str, otp: str, new_password: str):
+    return reset_password_with_otp(email, otp, new_password, client=client_id())
+def finish_reset():
+    end_reset(st.session_state.reset_id)
+    st.session_state.reset_id = None
+    if "reset" in st.query_params:
+        del st.query_params["reset"]
+def logout():
+    end_session(st.session_state.session_token)
+    st.session_state.session_token = None
+    st.session_state.session_cookie = ("", 0)
+    st.session_state.logged_in = False
+    st.session_state.mode = "Login"
+    st.rerun()
+def otp_delivery_status():
+    """Show where the OTP email is; polls every second until delivery finishes."""
+    handle = st.session_state.otp_delivery
+    if handle is None:
+        return
+
+    polling = not handle.done()
+
+    @st.fragment(run_every=1 if polling else None)
+    def status():
+        if handle.status == "sent":
+            st.success(f"OTP sent to {handle.to_addr}. Check your inbox.")
+        elif handle.done():
+            st.error("Failed to send OTP. Go back and try again.")
+        else:
+            st.info(f"Sending OTP to {handle.to_addr}…")
+        if polling and handle.done():
+            st.rerun()  # delivery finished: a full rerun drops the polling timer
+    status()
 # LOGIN / SIGNUP / FORGOT UI
 def auth_ui():
-    # Custom CSS for titles, labels, and inputs
-    st.markdown("""
-        <style>
-        /* App main title */
-        .app-title {
-            font-size: 72px;
-            font-weight: 800;
-            color: #ffffff;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-        /* Section titles like 🔐 Login, ✨ Signup */
-        .login-title {
-            font-size: 50px;
-            font-weight: bold;
-            color: #1abc9c;
-            margin-bottom: 1rem;
-            text-align: center;
-        }
-        /* ✅ Fix: Bigger labels for Email, Password, Username, OTP */
-        div[data-testid="stTextInput"] > div > div > p,
-        div[data-testid="stPasswordInput"] > div > div > p {
-            font-size: 100px !important;   /* bigger font */
-            font-weight: bold !important;  /* bold */
-            color: #ffffff !important;    /* white */
-        }
-        /* Input box text */
-        input {
-            font-size: 18px !important;
-            height: 45px !important;
-        }
-        /* Centered buttons with hover effect */
-        div.stButton {
-            display: flex;
-            justify-content: center;
-            margin-top: 10px;
-        }
-        /* Streamlit buttons - full width & centered */
-        div.stButton > button {
-            width: 100% !important;       /* FULL WIDTH inside its column */
-            padding: 1rem;
-            border-radius: 30px;
-            font-size: 24px;
-            font-weight: bold;
-            background-color: #1abc9c !important;
-            color: white !important;
-            transition: all 0.2s ease;
-        }
-        div.stButton > button:hover {
-            transform: translateY(-15px);
-            box-shadow: 0 6px 14px rgba(0,0,0,0.2);
-            background-color: #16a085 !important;
-        }
-
-        </style>
-    """, unsafe_allow_html=True)
+    # Titles, labels, inputs and buttons (css/auth.css)
+    inject_stylesheet("auth")
 
     # 🔥 Add the main app title here
     st.markdown('<div class="app-title">✨Welcome to Global Income Inequality Dashboard✨</div>', unsafe_allow_html=True)
@@ -106,7 +113,7 @@ def auth_ui():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         st.image(
-            "https://assets-v2.lottiefiles.com/a/fe0a9612-83f3-11ee-9945-27ca59862aef/gMMelbR6U7.gif",
+            image_source("login_hero"),
             use_container_width=True
         )
 
@@ -121,27 +128,6 @@ def auth_ui():
             login_password = st.text_input("Password", type="password", key="login_password")
             st.markdown("<div style='height:15px'></div>", unsafe_allow_html=True)
 
-            # CSS for Login button
-            st.markdown("""
-                <style>
-                .login-btn button {
-                    width: 100% !important;
-                    height: 55px !important;
-                    font-size: 22px !important;
-                    font-weight: bold !important;
-                    color: white !important;
-                    background-color: #1abc9c !important;
-                    border-radius: 10px !important;
-                    border: none !important;
-                    transition: all 0.3s ease;
-                }
-                .login-btn button:hover {
-                    background-color: #16a085 !important;
-                    transform: translateY(-2px);
-                    box-shadow: 0px 4px 12px rgba(0,0,0,0.2);
-                }
-             </style>
-            """, unsafe_allow_html=True)
 
             # Login button
             login_clicked = st.button("Login", key="login_btn", use_container_width=True, args=(), kwargs={})
@@ -149,8 +135,11 @@ def auth_ui():
                 if not login_email or not login_password:
                     st.error("Please enter email and password")
                 else:
-                    ok, msg = login(login_email, login_password)
+                    ok, msg = login(login_email, login_password, client=client_id())
                     if ok:
+                        # Always a new token: one issued before login is never upgraded
+                        st.session_state.session_token = start_session(login_email)
+                        st.session_state.session_cookie = (st.session_state.session_token, SESSION_TTL)
                         st.session_state.logged_in = True
                         st.success(msg)
                         st.rerun()
@@ -200,15 +189,16 @@ def auth_ui():
             if not forgot_email:
                 st.error("Please enter your email")
             else:
-                otp = send_otp(forgot_email)  # store the OTP returned by send_otp
+                otp, handle = send_otp(forgot_email, client=client_id())  # queued, delivered in the background
                 if otp:
-                    st.session_state.otp = otp
+                    st.session_state.reset_id = begin_reset(forgot_email)
+                    st.query_params["reset"] = st.session_state.reset_id  # resume after a reload
                     st.session_state.reset_email = forgot_email
-                    st.success(f"OTP sent to {forgot_email}. Check your inbox.")
+                    st.session_state.otp_delivery = handle
                     st.session_state.mode = "OTPVerification"
                     st.rerun()
                 else:
-                    st.error("Failed to send OTP. Try again.")
+                    st.error(f"Failed to send OTP: {handle.error}")
         if st.button("Back to Login", key="back_from_forgot_btn"):
             st.session_state.mode = "Login"
             st.rerun()
@@ -216,6 +206,7 @@ def auth_ui():
     # ---------------- OTP VERIFICATION ----------------
     elif st.session_state.mode == "OTPVerification":
         st.markdown('<div class="login-title">🔒 Verify OTP</div>', unsafe_allow_html=True)
+        otp_delivery_status()
         # OTP input is a widget with its own key; we read it into a local var
         entered_otp = st.text_input("Enter OTP", key="otp_input")
         new_password = st.text_input("Enter New Password", type="password", key="new_password")
@@ -225,21 +216,20 @@ def auth_ui():
                 st.error("Please fill all fields")
             elif new_password != confirm_password:
                 st.error("Passwords do not match")
-            elif not verify_otp(entered_otp):
-                st.error("Invalid OTP")
             else:
-                # reset_email is stored when send_otp() ran
-                if reset_password(st.session_state.reset_email, new_password):
-                    st.success("Password reset successfully!")
-                    # clear OTP so it can't be reused
-                    st.session_state.otp = ""
+                # reset_email is stored when send_otp() ran; the OTP is used up only if the reset succeeds
+                ok, msg = reset_password(st.session_state.reset_email, entered_otp, new_password)
+                if ok:
+                    st.success(msg)
+                    finish_reset()
                     st.session_state.reset_email = ""
                     st.session_state.mode = "Login"
                     st.rerun()
                 else:
-                    st.error("Error resetting password. Try again.")
+                    st.error(msg)
 
         if st.button("Back to Login", key="back_from_otp_btn"):
+            finish_reset()
             st.session_state.mode = "Login"
             st.rerun()
 
@@ -263,73 +253,14 @@ def render_theme_selector():
     st.markdown('</div>', unsafe_allow_html=True)
 
 def apply_theme():
-    """Apply selected theme CSS globally"""
-    if st.session_state.theme == "Dark":
-        st.markdown("""
-            <style>
-            [data-testid="stAppViewContainer"] {background-color: #111111 !important;}
-            [data-testid="stSidebar"] {background-color: #1c1c1c !important;}
-            [data-testid="stHeader"], [data-testid="stToolbar"] {background-color: #111111 !important;}
-            .css-1d391kg, .css-ffhzg2 {color: #f5f5f5 !important;}
-            .stButton>button {background-color: #1abc9c !important; color: white !important;}
-            </style>
-        """, unsafe_allow_html=True)
-    elif st.session_state.theme == "White":
-        st.markdown("""
-            <style>
-            [data-testid="stAppViewContainer"] {background-color: #ffffff !important; color: #000000 !important;}
-            [data-testid="stSidebar"] {background-color: #f0f2f6 !important; color: #000000 !important;}
-            [data-testid="stHeader"], [data-testid="stToolbar"] {background-color: #ffffff !important; color: #000000 !important;}
-            .css-1d391kg, .css-ffhzg2, .stMarkdown, p, h1, h2, h3, h4, h5, h6, span {color: #000000 !important;}
-            .stButton>button {background-color: #1abc9c !important; color: white !important;}
-            </style>
-        """, unsafe_allow_html=True)
+    """Apply selected theme CSS globally (css/theme-*.css + css/dashboard.css)"""
+    inject_theme_stylesheet(st.session_state.theme)
 
 # ---------------- DASHBOARD UI ----------------
 def dashboard_ui():
     # Render theme selector at top-right
     render_theme_selector()
     apply_theme()
-    # Lottie container styling (keeps your app look)
-    st.markdown("""
-    <style>
-    /* Sidebar container fix (ensures alignment) */
-    [data-testid="stSidebar"] {
-        padding-top: 20px;
-    }
-
-    /* Divi-style full-width buttons */
-    [data-testid="stSidebar"] .stButton>button {
-        display: block;
-        width: 150% !important;      /* All same width */
-        height: 50px !important;     /* All same height */
-        background-color: #0056b3 !important;
-        color: #fff !important;
-        font-weight: 600 !important;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        border-radius: 8px;          /* Rectangle look */
-        border: none;
-        text-align: center;
-        margin: 5px 0;               /* Equal spacing between buttons */
-        transition: all 0.3s ease-in-out;
-    }
-
-    /* Hover effect */
-    [data-testid="stSidebar"] .stButton>button:hover {
-        background-color: #007bff !important;
-        transform: translateY(-2px);
-        box-shadow: 0px 4px 8px rgba(0,0,0,0.15);
-    }
-
-    /* Active button highlight */
-    [data-testid="stSidebar"] .stButton>button:focus {
-        background-color: #0e6655 !important;
-        color: #fff !important;
-        outline: none;
-    }
-    </style>
-""", unsafe_allow_html=True)
     
     # ---------------- Sidebar Welcome Card ----------------
     st.sidebar.markdown(
@@ -350,61 +281,6 @@ def dashboard_ui():
         unsafe_allow_html=True
     )
 
-    # ---------------- CSS for Centered & Equal-Sized Buttons ----------------
-    st.sidebar.markdown(
-        """
-        <style>
-        /* Make sidebar a centered column */
-        [data-testid="stSidebar"] {
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            padding-top: 18px;
-        }
-        /* Target Streamlit button elements strongly and force fixed size */
-        [data-testid="stSidebar"] .stButton > button,
-        [data-testid="stSidebar"] div.stButton > button {
-            box-sizing: border-box !important;
-            width: 200px !important;       /* fixed width */
-            min-width: 200px !important;
-            max-width: 200px !important;
-            height: 52px !important;       /* fixed height */
-            margin: 10px 0 !important;     /* even spacing */
-            padding: 0 14px !important;    /* keep inner padding consistent */
-            display: flex !important;      
-            justify-content: center !important; /* center text horizontally */
-            align-items: center !important;     /* center text vertically */
-            white-space: nowrap !important;     /* prevent wrap */
-            overflow: hidden !important;
-            text-overflow: ellipsis !important;
-            background-color: #26b3e6 !important; /* your color */
-            color: #ffffff !important;
-            font-weight: 600 !important;
-            font-size: 16px !important;
-            border-radius: 12px !important;
-            border: none !important;
-            transition: transform 0.12s ease, box-shadow 0.12s ease;
-        }
-        /* Ensure inner span/div inside button fills full width and centers content */
-        [data-testid="stSidebar"] .stButton > button > span,
-        [data-testid="stSidebar"] .stButton > button > div {
-            display: inline-flex !important;
-            width: 100% !important;
-            justify-content: center !important;
-            align-items: center !important;
-        }
-        /* Hover */
-        [data-testid="stSidebar"] .stButton > button:hover {
-            transform: translateY(-3px) !important;
-            box-shadow: 0 6px 14px rgba(0,0,0,0.18) !important;
-            background-color: #17a0cf !important;
-        }
-        /* Extra gap before logout */
-        .logout-spacer { height: 36px; width: 100%; }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
 
     # Navigation title
     st.sidebar.markdown('<div style="width:100%; padding-left:12px; color:#800080; font-weight:700; font-size:23px; margin-bottom:6px;">Navigation</div>', unsafe_allow_html=True)
@@ -425,263 +301,52 @@ def dashboard_ui():
     # Spacer so Logout is separated
     st.sidebar.markdown('<div class="logout-spacer"></div>', unsafe_allow_html=True)
     if st.sidebar.button("📕  Logout", key="sidebar_Logout"):
-        st.session_state.logged_in = False
-        st.session_state.mode = "Login"
-        st.rerun()
-
-    #--------------- Home-----------------
-    if st.session_state.page == "Home":
-        def home_content():
-            st.markdown(
-                "<h1 style='text-align: center; font-size: 45px;'>🏠 Project Insights & Analysis</h1>",
-                unsafe_allow_html=True,
-            )
-            # Animation
-            lottie_home = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_jcikwtux.json")
-            st_lottie(lottie_home, speed=1, width=900, height=350, key="home_animation")
-            # Description (centered and larger text)
-            st.markdown(
-                "<h2 style='font-size: 28px;'>📌 Project Description</h2>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                "<p style='font-size: 20px; line-height: 1.6;'>"
-                "This project is a <b>Streamlit-based Login and Signup System</b> with a modern UI. "
-                "It integrates interactive dashboards, insights visualization, and AI chatbot support. "
-                "The application is designed to provide a seamless and engaging experience for users."
-                "</p>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                "<h2 style='font-size:28 px;'>📊 Dashboard Overview</h2>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                "<p style='font-size: 20px; line-height: 1.6;'>"
-                "This interactive Power BI dashboard provides a comprehensive visualization of key metrics and insights, enabling users to explore trends, patterns, and performance at a glance. "
-                "Designed for clarity and interactivity, it helps in making data-driven decisions efficiently."
-                "</p>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                "<h2 style='font-size:28 px;'>🎯 Objectives</h2>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                "<p style='font-size: 20px; line-height: 1.6;'>"
-                "1. Develop a web app with a clean UI for user management. <br>" 
-                "2. Ensure persistent storage of user data using TinyDB. <br>"  
-                "3. Integrate Power BI dashboards for analytics. <br>"
-                "4. Collect and manage user feedback effectively."
-                "</p>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                "<h2 style='font-size:28 px;'>✨ Key Features</h2>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                "<p style='font-size: 20px; line-height: 1.6;'>"
-                "🟢 Signup and Login with validation. <br>"
-                "🟢 Interactive sidebar navigation. <br>"
-                "🟢 Embedded Power BI dashboards for real-time insights. <br>"
-                "🟢 Feedback collection form. <br>"
-                "🟢 Responsive and modern design. "
-                "</p>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                "<h2 style='font-size:28 px;'>💡 Insights</h2>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                "<p style='font-size: 20px; line-height: 1.6;'>"
-                "➡️ User registrations are steadily increasing each month. <br>"
-                "➡️ Feedback shows growing engagement and interaction. <br>"
-                "➡️ The system can be extended for role-based dashboards in future. "
-                "</p>",
-                unsafe_allow_html=True
-            )
-        centered_layout(home_content)
+        logout()
 
-    #------------------Dashboard----------------------------------------
-    elif st.session_state.page == "Dashboard":
-        # Heading (centered)
-        st.markdown(
-            "<h1 style='text-align:center; font-size:45px;'>📊 Dashboard</h1>",
-            unsafe_allow_html=True
-        )
-        # Centered GIF using columns
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.image(
-                "https://cdnl.iconscout.com/lottie/premium/thumb/web-dashboard-animation-gif-download-4596740.gif",
-                use_container_width=True  # updated parameter
-            )
-        # ---------------- Left-aligned content ----------------
-        st.subheader("Power BI Dashboard Overview")
-        powerbi_url = "https://app.powerbi.com/view?r=eyJrIjoiOGE0ZWJlOWUtYjYxNS00Mzc1LTg2ODktMjA0YjNhNzQxNTFiIiwidCI6ImRiYTUxZDMwLTA2MGMtNDVhNC1hOTUyLTUyMWU4YWQ1OWE2OCJ9"
+    render_page()  # each page times itself as page.<name> (views/__init__.py)
 
-        st.markdown(f"""
-            <div class="powerbi-container">
-                <iframe title="PowerBI Dashboard"
-                    width="100%" height="700"
-                    src="{powerbi_url}"
-                    frameborder="0" allowFullScreen="true"></iframe>
-            </div>
-        """, unsafe_allow_html=True)
+def render_page():
+    # Home, Dashboard, Insights, Profile and Feedback live in views/, one module per page
+    if st.session_state.page in views.PAGES:
+        views.render(st.session_state.page)
 
-     #--------------------Insights Section----------------------------------------
-    elif st.session_state.page == "Insights":
-        def insights_content():
-            # Title with bigger font
-            st.markdown(
-                "<h1 style='text-align:center; font-size:45px;'>📈 Insights & Key Learnings</h1>",
-                unsafe_allow_html=True
-            )
-            # 🚀 User Engagement Trends
-            st.markdown("<h2 style='font-size:28px;'>🚀 User Engagement Trends</h2>", unsafe_allow_html=True)
-            st.markdown(
-                "<p style='font-size:20px; line-height:1.8;'>"
-                "Our analytics reveal a <b>steady increase in user engagement</b> over the last few weeks.<br>"
-                "The login frequency indicates that users are returning consistently,<br>"
-                "suggesting growing trust in the platform."
-                "</p>",
-                unsafe_allow_html=True
-            )
-            # 📊 Dashboard Utilization
-            st.markdown("<h2 style='font-size:28px;'>📊 Dashboard Utilization</h2>", unsafe_allow_html=True)
-            st.markdown(
-                """
-                <ul style='font-size:20px; line-height:1.8;'>
-                    <li>Monthly Active Users (MAU)</li>
-                    <li>Feedback Sentiment Analysis</li>
-                    <li>Sign-up Growth Patterns</li>
-                </ul>
-                """,
-                unsafe_allow_html=True
-            )
-            # 🎯 Business Insights
-            st.markdown("<h2 style='font-size:28px;'>🎯 Business Insights</h2>", unsafe_allow_html=True)
-            st.markdown(
-                """
-                <ul style='font-size:20px; line-height:1.8;'>
-                    <li><b>Sign-up growth</b> is strongest at the beginning of each month.</li>
-                    <li><b>Feedback sentiment</b> is largely positive, but UI performance could improve.</li>
-                    <li><b>Returning user ratio</b> is 60%+, showing strong retention.</li>
-                </ul>
-                """,
-                unsafe_allow_html=True
-            )
-            # ✨ Recommendations
-            st.markdown("<h2 style='font-size:28px;'>✨ Recommendations</h2>", unsafe_allow_html=True)
-            st.markdown(
-                """
-                <ol style='font-size:20px; line-height:1.8;'>
-                    <li>Strengthen onboarding with guided walkthroughs</li>
-                    <li>Enhance dashboard performance to reduce load time</li>
-                    <li>Introduce role-based dashboards</li>
-                    <li>Encourage feedback loops for evolving user needs</li>
-                </ol>
-                """,
-                unsafe_allow_html=True
-            )
-        # Wrap into center layout
-        centered_layout(insights_content)
-
-    #-----------------------Profile------------------
-    elif st.session_state.page == "Profile":
-        # Personal Information (centered in a card)
-        def profile_info_content():
-            st.markdown(
-                "<h1 style='text-align:center; font-size:36px;'>👤 Profile</h1>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                """
-                <div style="
-                    background-color: #595959;
-                    padding: 25px;
-                    border-radius: 15px;
-                    box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-                    text-align: center;
-                    width: 80%;
-                    margin: auto;
-                    margin-bottom: 30px;
-                ">
-                    <h2 style="font-size:26px; margin-bottom:15px;">Personal Information</h2>
-                    <p style="font-size:20px; line-height:1.8; margin:0;">
-                        <b>Name:</b> Mohammad Ashee <br>
-                        <b>Username:</b> Ashee_Md <br>
-                        <b>Email:</b> asheemohammad123@gmail.com <br>
-                    </p>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-        centered_layout(profile_info_content)  # 👈 Profile card centered
-
-        # Update Profile Section (centered but no card)
-        def update_profile_content():
-            st.markdown("<h2 style='text-align:center; font-size:36px; margin-top:30px;'>Update Profile Information</h2>", unsafe_allow_html=True)
-
-            with st.form("update_profile_form"):
-                st.markdown(
-                    """
-                    <div style="display:flex; justify-content:center; flex-direction:column; align-items:center; gap:10px; width:100%;">
-                    """,
-                    unsafe_allow_html=True
-                )
-
-                new_name = st.text_input("Full Name", key="update_name", max_chars=50, help="Enter your full name")
-                new_username = st.text_input("Username", key="update_username", max_chars=30, help="Enter your username")
-                new_email = st.text_input("Email", key="update_email", max_chars=50, help="Enter your email")
-                submitted = st.form_submit_button("Update Profile")
-                if submitted:
-                    st.success("✅ Profile updated successfully!")
-                st.markdown("</div>", unsafe_allow_html=True)
-
-        centered_layout(update_profile_content)  # Form centered cleanly
-
-    #--------------Feedback----------------------
-    elif st.session_state.page == "Feedback":
-        def feedback_content():
-            st.markdown(
-                "<h1 style='text-align:center; font-size:36px;'>💬 Feedback</h1>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                """
-                <div style="
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    gap: 15px;
-                    width: 60%;
-                    font-size:28px;
-                    margin: auto;
-                ">
-                """,
-                unsafe_allow_html=True
-            )
-            # Feedback text area
-            feedback = st.text_area("Enter your feedback here:", height=150, key="feedback_text")
-            # Submit button
-            if st.button("Submit Feedback", key="submit_feedback_btn"):
-                st.success("✅ Thanks for your feedback!")
-            st.markdown("</div>", unsafe_allow_html=True)
-        centered_layout(feedback_content)
-    
     #--------------------Logout-----------------
     elif st.session_state.page == "Logout":
-        st.session_state.logged_in = False
-        st.session_state.mode = "Login"
-        st.rerun()
-        pass
+        logout()
+
+# ---------------- Debug overlay ----------------
+def render_debug_overlay(rerun_started):
+    """Span timings for this rerun and the process so far (METRICS_ENABLED=1, open with ?debug=1)"""
+    with st.sidebar.expander("⏱ Debug timings", expanded=True):
+        st.caption(f"This rerun: {(time.perf_counter() - rerun_started) * 1000:.1f} ms")
+        st.dataframe(
+            [{"span": name, "ms": round(seconds * 1000, 2)} for name, seconds in rerun_spans()],
+            hide_index=True, use_container_width=True,
+        )
+        st.caption("Since process start (p50/p95 are histogram bucket bounds)")
+        st.dataframe(
+            [
+                {"span": name, "count": count, "mean ms": round(total / count * 1000, 2),
+                 "p50 ms": p50 * 1000, "p95 ms": p95 * 1000}
+                for name, (count, total, p50, p95) in snapshot().items()
+            ],
+            hide_index=True, use_container_width=True,
+        )
 
 # ---------------- MAIN APP ----------------
-if not st.session_state.logged_in:
-    auth_ui()  # your auth UI
-else:
-    dashboard_ui()
+serve_metrics()  # Prometheus text on METRICS_PORT; a no-op unless METRICS_ENABLED=1
+if os.environ.get("DATA_API_PORT", "0") != "0":
+    from data_api import serve_api  # pulls in numpy and pyarrow, so only when the API is wanted
+    serve_api()  # read-only JSON metrics API for other services (data_api.py)
+begin_rerun()
+rerun_started = time.perf_counter()
+with span("rerun"):
+    if not st.session_state.logged_in:
+        auth_ui()  # your auth UI
+    else:
+        dashboard_ui()
+if st.session_state.session_cookie is not None:
+    write_session_cookie(*st.session_state.session_cookie)
+    st.session_state.session_cookie = None
+if METRICS_ENABLED and st.query_params.get("debug") == "1":
+    render_debug_overlay(rerun_started)
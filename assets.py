@@ -0,0 +1,45 @@
+# assets.py
+"""Local, pre-optimized copies of the app's images.
+
+build_assets.py downloads the remote GIFs below once, transcodes them to
+animated WebP (plus a static poster frame) at a few widths and writes
+content-hashed files and a manifest to static/assets/. Streamlit serves that
+folder at /app/static/, and because every file name carries its content hash
+the browser can keep it forever.
+
+If the build has not been run, image_source() falls back to the remote URL so
+the app still works, just slower.
+"""
+import json
+import os
+
+REMOTE_IMAGES = {
+    "login_hero": "https://assets-v2.lottiefiles.com/a/fe0a9612-83f3-11ee-9945-27ca59862aef/gMMelbR6U7.gif",
+    "dashboard_hero": "https://cdnl.iconscout.com/lottie/premium/thumb/web-dashboard-animation-gif-download-4596740.gif",
+}
+WIDTHS = (320, 640, 960)
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "assets")
+MANIFEST_PATH = os.path.join(ASSET_DIR, "manifest.json")
+STATIC_URL = "/app/static/assets/"
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_manifest = _load_manifest()
+
+
+def image_source(name: str, width: int = 640, animated: bool = True) -> str:
+    """URL of the smallest local variant at least `width` px wide (or the remote original)."""
+    entry = _manifest.get(name)
+    if not entry:
+        return REMOTE_IMAGES[name]
+    variants = sorted(entry["variants"], key=lambda v: v["width"])
+    chosen = next((v for v in variants if v["width"] >= width), variants[-1])
+    return STATIC_URL + chosen["animated" if animated else "poster"]
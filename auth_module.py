@@ -1,53 +1,179 @@
 # auth.py
-from tinydb import TinyDB, Query
-import smtplib
-from email.mime.text import MIMEText
-import random
+# Importing this module is cheap: stores are opened on first use, and the
+# SMTP, e-mail and engagement (numpy) machinery is imported by the functions
+# that need it, so a visitor who only sees the Login form never pays for them.
+from user_store import open_user_store
+from passwords import PasswordPoolBusy, dummy_hash, hash_password, needs_rehash, verify_password
+from admission import Throttled, admit_login, check
+from session_store import OTP_TTL, SESSION_TTL, get_session_store
+from telemetry import span, timed
+import hmac
+import secrets
+import threading
 
-# Initialize DB (file created automatically)
-db = TinyDB("users.json")
-users_table = db.table("users")
+_users = None
+_users_lock = threading.Lock()
 
 
+def get_users():
+    """The user store (SQLite by default, see user_store.py), opened on first use."""
+    global _users
+    with _users_lock:
+        if _users is None:
+            _users = open_user_store()
+        return _users
+
+
+def _record(kind, email):
+    from engagement import record  # pulls in numpy, so not until the first event
+
+    record(kind, email)
+
+
+@timed("auth.signup")
 def signup(email: str, password: str):
     """Register a new user. Returns (success: bool, message: str)."""
-    User = Query()
-    if users_table.search(User.email == email):
+    if get_users().get(email) is not None:
         return False, "User already exists!"
-    users_table.insert({"email": email, "password": password})
+    try:
+        hashed = hash_password(password)
+    except PasswordPoolBusy as e:
+        return False, str(e)
+    if not get_users().add(email, hashed):
+        return False, "User already exists!"
+    _record("signup", email)
     return True, "Account created successfully!"
 
 
-def login(email: str, password: str):
-    """Check login credentials. Returns (success: bool, message: str)."""
-    User = Query()
-    user = users_table.search((User.email == email) & (User.password == password))
-    if user:
+@timed("auth.login")
+def login(email: str, password: str, client: str = None):
+    """Check login credentials. Returns (success: bool, message: str).
+
+    Requests over the per-email / per-client rate or the global concurrency cap
+    are rejected before any storage or hashing work (see admission.py).
+    Plaintext records from before password hashing are upgraded on their next successful login.
+    """
+    try:
+        with admit_login(email, client):
+            with span("auth.user_lookup"):
+                user = get_users().get(email)
+            stored = user["password"] if user is not None else dummy_hash()
+            with span("auth.password_verify"):
+                ok = verify_password(password, stored) and user is not None
+            if ok and needs_rehash(stored):
+                try:
+                    get_users().set_password(email, hash_password(password))
+                except PasswordPoolBusy as e:  # best effort: keep the old hash and retry on a later login
+                    print("❌ Password rehash skipped:", e)
+    except (Throttled, PasswordPoolBusy) as e:
+        return False, str(e)
+    if ok:
+        _record("login", email)
         return True, "Login successful!"
     return False, "Invalid email or password"
 
 
-def send_otp(email: str):
-    """Send OTP to the given email and return the OTP."""
-    otp = str(random.randint(100000, 999999))  # generate 6-digit OTP
+def update_password(email: str, new_password: str) -> bool:
+    """Replace the stored password for an existing user. Returns True on success."""
+    if get_users().get(email) is None:
+        return False
+    try:
+        return get_users().set_password(email, hash_password(new_password))
+    except PasswordPoolBusy:
+        return False
+
+
+@timed("auth.send_otp")
+def send_otp(email: str, client: str = None):
+    """Queue an OTP email for background delivery.
+
+    Returns (otp, handle): the 6-digit OTP and a DeliveryHandle the UI can poll.
+    otp is None when the request was throttled or the delivery queue is full;
+    handle.error then says why.
+    """
+    from email.mime.text import MIMEText
+    from otp_delivery import get_delivery_queue, rejected_handle, REJECTED
+
+    try:
+        check("otp", email, client)
+    except Throttled as e:
+        return None, rejected_handle(email, str(e))
+    otp = str(100000 + secrets.randbelow(900000))  # generate 6-digit OTP
+    queue = get_delivery_queue()
+
+    msg = MIMEText(f"Your OTP for password reset is: {otp}")
+    msg["Subject"] = "Password Reset OTP"
+    msg["From"] = queue.config.user
+    msg["To"] = email
+
+    handle = queue.submit(email, msg)
+    if handle.status == REJECTED:
+        print("❌ Error sending email:", handle.error)
+        return None, handle
+    get_session_store().set(f"otp:{email}", otp, OTP_TTL)
+    return otp, handle
+
+
+def verify_otp(email: str, otp: str) -> bool:
+    """Redeem the OTP sent to email. Succeeds at most once, on whichever replica asks first."""
+    return get_session_store().consume(f"otp:{email}", otp)
+
+
+def reset_password_with_otp(email: str, otp: str, new_password: str, client: str = None):
+    """Set a new password if otp is the one mailed to email. Returns (success: bool, message: str).
+
+    Guesses are rate-limited per email and per client (see admission.py), so a
+    6-digit code cannot be brute-forced within its TTL. The OTP is only used up
+    once the new password is stored, so a busy hashing pool does not cost the
+    user their code.
+    """
     try:
-        sender = "asheemohammad123@gmail.com"   # <-- replace with your Gmail
-        password = "jxeaeuilwswpfyro"   # <-- replace with Gmail App Password
-
-        msg = MIMEText(f"Your OTP for password reset is: {otp}")
-        msg["Subject"] = "Password Reset OTP"
-        msg["From"] = sender
-        msg["To"] = email
-
-        # Gmail SMTP setup
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(sender, password)
-        server.sendmail(sender, [email], msg.as_string())
-        server.quit()
-
-        print("✅ OTP email sent to", email)
-        return otp
-    except Exception as e:
-        print("❌ Error sending email:", e)
-        return None
+        check("otp_verify", email, client)
+    except Throttled as e:
+        return False, str(e)
+    current = get_session_store().get(f"otp:{email}")
+    if current is None or not hmac.compare_digest(current.encode(), otp.encode()):
+        return False, "Invalid or expired OTP"
+    if not update_password(email, new_password):
+        return False, "Error resetting password. Try again."
+    verify_otp(email, otp)  # a concurrent reset with the same code may have used it up first; either way it is gone
+    return True, "Password reset successfully!"
+
+
+# ---------------- Shared sessions ----------------
+# Tokens are issued here, never taken from the client, so nobody can plant a
+# known one (session fixation). The login token lives in a cookie (app.py);
+# the reset id goes in the URL only while a password reset is unfinished, and
+# is useless without the OTP mailed to the account's owner.
+def start_session(email: str) -> str:
+    """Log email in under a fresh random token. Returns the token."""
+    token = secrets.token_urlsafe(32)
+    get_session_store().set(f"session:{token}", email, SESSION_TTL)
+    return token
+
+
+def session_user(token):
+    """Email logged in under token, or None."""
+    return get_session_store().get(f"session:{token}") if token else None
+
+
+def end_session(token):
+    if token:
+        get_session_store().delete(f"session:{token}")
+
+
+def begin_reset(email: str) -> str:
+    """Remember an unfinished password reset for email under a fresh id. Returns the id."""
+    reset_id = secrets.token_urlsafe(24)
+    get_session_store().set(f"reset:{reset_id}", email, OTP_TTL)
+    return reset_id
+
+
+def pending_reset(reset_id):
+    """Email whose password reset reset_id started and has not finished, or None."""
+    return get_session_store().get(f"reset:{reset_id}") if reset_id else None
+
+
+def end_reset(reset_id):
+    if reset_id:
+        get_session_store().delete(f"reset:{reset_id}")
@@ -0,0 +1,99 @@
+"""Login/signup latency before and after the email index in auth_module.
+
+"before" replays the old Query scan against a plain TinyDB file,
+"after" goes through auth_module itself on the chosen user store backend
+(the SQLite store is migrated from the same users.json first). Usage:
+
+    python benchmarks/bench_auth_lookup.py --sizes 10000 100000 1000000 --backend sqlite
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from tinydb import TinyDB, Query
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# This measures lookups, not password hashing (see bench_password_hashing.py)
+os.environ.setdefault("PASSWORD_SCRYPT_N", "16")
+
+
+def make_users_file(path, n):
+    """Write a TinyDB users.json with n synthetic users straight to disk."""
+    users = {str(i + 1): {"email": f"user{i}@example.com", "password": f"pw{i}"} for i in range(n)}
+    with open(path, "w") as f:
+        json.dump({"users": users}, f)
+
+
+def timed(fn, repeat):
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_before(path, n, repeat):
+    table = TinyDB(path).table("users")
+    User = Query()
+
+    # A different email each time keeps TinyDB's query cache out of the picture;
+    # the last documents are the worst case for a scan.
+    def old_login(i):
+        k = n - 1 - i
+        table.search((User.email == f"user{k}@example.com") & (User.password == f"pw{k}"))
+
+    def old_signup(i):
+        email = f"new{i}@example.com"
+        if not table.search(User.email == email):
+            table.insert({"email": email, "password": "pw"})
+
+    return timed(old_login, repeat), timed(old_signup, repeat)
+
+
+def bench_after(path, n, repeat, backend):
+    os.environ["USER_STORE_BACKEND"] = backend
+    if backend == "sqlite":
+        os.environ["LEGACY_USERS_JSON"] = path
+        os.environ["USERS_DB_PATH"] = path + ".db"
+    else:
+        os.environ["USERS_DB_PATH"] = path
+    import auth_module
+    auth_module = importlib.reload(auth_module)
+
+    def new_login(i):
+        k = n - 1 - i
+        auth_module.login(f"user{k}@example.com", f"pw{k}")
+
+    def new_signup(i):
+        auth_module.signup(f"new{i}@example.com", "pw")
+
+    return timed(new_login, repeat), timed(new_signup, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", choices=["sqlite", "tinydb"], default="sqlite")
+    args = parser.parse_args()
+
+    print(f"{'users':>10} | {'login before':>12} | {'login after':>11} | {'signup before':>13} | {'signup after':>12}  (median ms)")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            before_path = os.path.join(tmp, "before.json")
+            after_path = os.path.join(tmp, "after.json")
+            make_users_file(before_path, n)
+            make_users_file(after_path, n)
+            login_before, signup_before = bench_before(before_path, n, args.repeat)
+            login_after, signup_after = bench_after(after_path, n, args.repeat, args.backend)
+        print(f"{n:>10} | {login_before:>12.3f} | {login_after:>11.3f} | {signup_before:>13.3f} | {signup_after:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
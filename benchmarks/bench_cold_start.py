@@ -0,0 +1,109 @@
+"""Cold start: import time and first render of app.py in a fresh interpreter.
+
+For each page, a new `python -X importtime` process loads AppTest and then
+renders app.py once, on the Login screen or logged in on Home / Dashboard.
+The benchmark records the first-render wall time and the total self time of
+every module imported while rendering, i.e. the app's own import cost on
+top of Streamlit. The heaviest of those imports are listed, so a new eager
+import shows up by name.
+
+Results use the bench_suite.py JSON format, so releases can be tracked with
+
+    python benchmarks/bench_cold_start.py --out benchmarks/baselines/cold-start.json
+    python benchmarks/bench_suite.py compare benchmarks/baselines/cold-start.json new.json
+
+Lottie is served from a pre-seeded disk cache and a synthetic dataset is
+ingested unless INCOME_DATA_DIR is set, so nothing touches the network.
+The Dashboard snapshot job is off (SNAPSHOT_INTERVAL=0).
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import APP_DIR, ensure_dataset  # noqa: E402
+
+MARKER = "--- render ---"
+CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+sys.stderr.write({marker!r} + "\\n")
+start = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=300)
+if {page!r} != "Login":
+    at.session_state.logged_in = True
+    at.session_state.page = {page!r}
+at.run()
+print(json.dumps({{"first_render_ms": (time.perf_counter() - start) * 1000, "errors": len(at.exception)}}))
+"""
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def cold_render(app_path, page, env):
+    """One fresh process: (first render ms, app import ms, {top-level module: cumulative ms})."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(marker=MARKER, app=app_path, page=page)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["errors"]:
+        raise RuntimeError(f"{page} page raised during first render")
+    stderr = proc.stderr.split(MARKER, 1)[1]
+    imports_ms, top = 0.0, {}
+    for self_us, cumulative_us, indent, name in IMPORT_LINE.findall(stderr):
+        imports_ms += int(self_us) / 1000
+        if not indent:  # imported directly by the render, not by another module
+            top[name] = top.get(name, 0) + int(cumulative_us) / 1000
+    return result["first_render_ms"], imports_ms, top
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("app", nargs="?", default=os.path.join(APP_DIR, "app.py"))
+    parser.add_argument("--pages", nargs="+", default=["Login", "Home", "Dashboard"])
+    parser.add_argument("--repeat", type=int, default=3, help="fresh processes per page (median is kept)")
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args()
+    app_path = os.path.abspath(args.app)
+    out = os.path.abspath(args.out) if args.out else None
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    ensure_dataset()
+    # No snapshot job: a render thread left running at exit would crash the interpreter's shutdown
+    env = dict(os.environ, LOTTIE_WARMUP="0", SNAPSHOT_INTERVAL="0", LOTTIE_CACHE_DIR=os.path.join(workdir, "lottie"))
+    sys.path.insert(0, os.path.dirname(app_path))
+    os.environ["LOTTIE_CACHE_DIR"] = env["LOTTIE_CACHE_DIR"]
+    import lottie_cache
+    for path in [app_path, *glob.glob(os.path.join(os.path.dirname(app_path), "views", "*.py"))]:
+        with open(path) as f:
+            for url in re.findall(r'_LOTTIE_URL = "([^"]+)"', f.read()):
+                lottie_cache._write_disk({"url": url, "fetched_at": time.time() + 10 ** 9, "data": {}})
+
+    results = {}
+    for page in args.pages:
+        runs = [cold_render(app_path, page, env) for _ in range(args.repeat)]
+        render_ms = statistics.median(r[0] for r in runs)
+        imports_ms = statistics.median(r[1] for r in runs)
+        results[f"coldstart.{page}.first_render"] = {"value": round(render_ms, 1), "unit": "ms", "better": "lower"}
+        results[f"coldstart.{page}.imports"] = {"value": round(imports_ms, 1), "unit": "ms", "better": "lower"}
+        heaviest = sorted(runs[-1][2].items(), key=lambda kv: -kv[1])[:6]
+        print(f"{page:>10}: first render {render_ms:7.1f} ms, of which imports {imports_ms:7.1f} ms")
+        print(" " * 12 + ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest))
+
+    if out:
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        with open(out, "w") as f:
+            json.dump({"meta": {"app": app_path, "python": sys.version.split()[0]}, "results": results}, f, indent=2)
+        print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
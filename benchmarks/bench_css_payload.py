@@ -0,0 +1,44 @@
+"""Bytes of stylesheet markup sent to the browser on each rerun.
+
+Runs app.py under Streamlit's AppTest on the Login page and on every
+dashboard page, and sums the markdown elements that carry CSS (<style> blocks
+or stylesheet <link> tags). Network calls are stubbed. Usage:
+
+    python benchmarks/bench_css_payload.py [path/to/app.py]
+"""
+import os
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def css_bytes(at):
+    return sum(
+        len(md.value.encode())
+        for md in at.markdown
+        if "<style" in md.value or 'rel="stylesheet"' in md.value
+    )
+
+
+def main():
+    app_path = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else os.path.join(APP_DIR, "app.py"))
+    sys.path.insert(0, os.path.dirname(app_path))
+    os.environ["LOTTIE_WARMUP"] = "0"
+    os.chdir(tempfile.mkdtemp())
+
+    import lottie_cache
+    lottie_cache.get_lottie = lambda url: {}
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=30).run()
+    print(f"{'Login':>10}: {css_bytes(at):>6} bytes")
+    at.session_state.logged_in = True
+    for page in ["Home", "Dashboard", "Insights", "Profile", "Feedback"]:
+        at.session_state.page = page
+        at.run()
+        print(f"{page:>10}: {css_bytes(at):>6} bytes")
+
+
+if __name__ == "__main__":
+    main()
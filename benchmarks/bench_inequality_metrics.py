@@ -0,0 +1,51 @@
+"""Throughput of inequality_metrics on a World Bank/WID-sized panel.
+
+Compares one vectorized all_metrics() call over the whole panel with the
+per-country-year loop it replaces. Usage:
+
+    python benchmarks/bench_inequality_metrics.py [--countries 217] [--years 64] [--groups 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inequality_metrics  # noqa: E402
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--countries", type=int, default=217)
+    parser.add_argument("--years", type=int, default=64)
+    parser.add_argument("--groups", type=int, default=100, help="percentile groups per country-year")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = args.countries * args.years
+    rng = np.random.default_rng(42)
+    sigma = rng.uniform(0.4, 1.2, size=(rows, 1))
+    panel = rng.lognormal(mean=9.0, sigma=sigma, size=(rows, args.groups))
+
+    vectorized = best_of(lambda: inequality_metrics.all_metrics(panel), args.repeat)
+    looped = best_of(lambda: [inequality_metrics.all_metrics(row) for row in panel], 1)
+
+    print(f"panel: {args.countries} countries x {args.years} years x {args.groups} groups = {rows} rows")
+    print(f"vectorized: {vectorized * 1000:9.1f} ms  ({rows / vectorized:,.0f} country-years/s)")
+    print(f"per-row:    {looped * 1000:9.1f} ms  ({rows / looped:,.0f} country-years/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Per-interaction rerun time: what one widget change on a page costs.
+
+Starts `streamlit run` on the given app (default: this repo's app.py) and
+drives it over the websocket like load_sessions.py does: log in, open a
+page, then repeat one in-page interaction --repeat times. Each interaction
+is timed from the BackMsg until the run finishes, and the bytes of
+ForwardMsgs it produced are counted. Widgets drawn inside an st.fragment
+are rerun as that fragment only, as the browser would do.
+
+    Feedback   type feedback and press Submit
+    Profile    press Update Profile in the profile form
+    Dashboard  toggle "All countries" on the trajectory chart (after
+               switching from the snapshots to the interactive charts)
+
+Compare two trees by pointing it at each app.py:
+
+    git worktree add /tmp/before HEAD~1
+    python benchmarks/bench_interaction.py /tmp/before/app.py --out before.json
+    python benchmarks/bench_interaction.py --out after.json
+    python benchmarks/bench_suite.py compare before.json after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import APP_DIR, ensure_dataset  # noqa: E402
+from load_sessions import Browser, free_port, seed_lottie_cache, start_server  # noqa: E402
+
+EMAIL = "bench@example.com"
+
+
+def interactions(browser, i):
+    """{page: coroutine factory performing that page's interaction number i}"""
+    return {
+        "Feedback": lambda: browser._run(["submit_feedback_btn"], feedback_text=f"Interaction benchmark {i}"),
+        "Profile": lambda: browser._run(["Update Profile"]),
+        "Dashboard": lambda: browser._run(trajectory_all=i % 2 == 0),
+    }
+
+
+async def measure(url, page, repeat):
+    browser = Browser(url, EMAIL)
+    await browser.connect()
+    await browser._run()
+    await browser._run(["login_btn"], login_email=EMAIL, login_password="pw")
+    await browser._run([f"sidebar_{page}"])
+    if page == "Dashboard" and "dashboard_live" in browser.widgets:
+        await browser._run(dashboard_live=True)
+    await interactions(browser, -1)[page]()  # warm caches for this page
+    browser.latencies, sizes = [], []
+    for i in range(repeat):
+        await interactions(browser, i)[page]()
+        sizes.append(browser.bytes_received)
+    await browser.ws.close()
+    if browser.errors:
+        raise RuntimeError(f"{page} page raised during the benchmark")
+    return statistics.median(browser.latencies), statistics.median(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("app", nargs="?", default=os.path.join(APP_DIR, "app.py"))
+    parser.add_argument("--pages", nargs="+", default=["Feedback", "Profile", "Dashboard"])
+    parser.add_argument("--repeat", type=int, default=30, help="interactions per page (median is kept)")
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args()
+    app_path = os.path.abspath(args.app)
+    out = os.path.abspath(args.out) if args.out else None
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)  # user, session, feedback and engagement stores land here
+    ensure_dataset()
+    env = dict(os.environ, LOTTIE_WARMUP="0", LOTTIE_CACHE_DIR=os.path.join(workdir, "lottie"))
+    env.setdefault("PASSWORD_SCRYPT_N", "1024")
+    seed_lottie_cache(os.path.dirname(app_path), env["LOTTIE_CACHE_DIR"])
+    try:
+        import dashboard_snapshots
+        dashboard_snapshots.refresh()
+    except ImportError:  # a tree from before Dashboard snapshots
+        pass
+    os.environ["PASSWORD_SCRYPT_N"] = env["PASSWORD_SCRYPT_N"]
+    import auth_module
+    auth_module.signup(EMAIL, "pw")
+
+    port = free_port()
+    server = start_server(workdir, port, env, app_path)
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    results = {}
+    try:
+        for page in args.pages:
+            ms, size = asyncio.run(measure(url, page, args.repeat))
+            results[f"interaction.{page}"] = {"value": round(ms, 1), "unit": "ms", "better": "lower"}
+            results[f"interaction.{page}.bytes"] = {"value": size, "unit": "B", "better": "lower"}
+            print(f"{page:>10}: {ms:7.1f} ms per interaction, {size / 1024:7.1f} KiB sent to the browser")
+    finally:
+        server.terminate()
+        server.wait()
+
+    if out:
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        with open(out, "w") as f:
+            json.dump({"meta": {"app": app_path, "python": sys.version.split()[0]}, "results": results}, f, indent=2)
+        print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Login throughput and latency with scrypt hashing on the bounded pool.
+
+Creates a temporary SQLite user store, signs up --users accounts, then runs
+--clients threads logging in concurrently (as many Streamlit sessions
+would) and reports throughput, p50 and p99 latency and pool rejections.
+Cost and pool settings come from the PASSWORD_* environment variables.
+Usage:
+
+    PASSWORD_SCRYPT_N=16384 PASSWORD_WORKERS=4 python benchmarks/bench_password_hashing.py --clients 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=20, help="logins per client")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["USERS_DB_PATH"] = os.path.join(tmp, "users.db")
+    os.environ["LEGACY_USERS_JSON"] = os.path.join(tmp, "users.json")
+    import auth_module
+    import passwords
+
+    for i in range(args.users):
+        auth_module.signup(f"user{i}@example.com", f"pw{i}")
+
+    latencies, rejected = [], []
+    lock = threading.Lock()
+
+    def client(c):
+        mine, busy = [], 0
+        for j in range(args.logins):
+            k = (c * args.logins + j) % args.users
+            start = time.perf_counter()
+            ok, msg = auth_module.login(f"user{k}@example.com", f"pw{k}")
+            mine.append(time.perf_counter() - start)
+            busy += not ok
+        with lock:
+            latencies.extend(mine)
+            rejected.append(busy)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(args.clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    print(f"scrypt n={passwords.N} r={passwords.R} p={passwords.P}, workers={passwords.WORKERS}, "
+          f"max pending={passwords.MAX_PENDING}, clients={args.clients}")
+    print(f"throughput: {len(ms) / elapsed:8.1f} logins/s")
+    print(f"latency:    p50 {np.percentile(ms, 50):7.1f} ms   p99 {np.percentile(ms, 99):7.1f} ms")
+    print(f"rejected:   {sum(rejected)} of {len(ms)}")
+
+
+if __name__ == "__main__":
+    main()
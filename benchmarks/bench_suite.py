@@ -0,0 +1,236 @@
+"""Benchmark suite: auth latency/throughput and per-page rerun time, with baselines.
+
+auth: signup and login latency (p50/p95) against synthetic SQLite user
+tables of each --sizes, and login throughput from --clients threads.
+Password hashing runs at --scrypt-n (default 16, i.e. the lookup path; pass
+16384 for production cost, see bench_password_hashing.py).
+
+pages: full-script rerun time of app.py for every page under Streamlit's
+AppTest, with Lottie fetches stubbed out, a synthetic dataset ingested
+into a temporary INCOME_DATA_DIR (unless one is already set) and the
+Dashboard snapshots rendered.
+
+Results are written as JSON, {metric: {"value", "unit", "better"}}, and
+compare mode flags every metric that got worse by more than --threshold:
+
+    python benchmarks/bench_suite.py run --out benchmarks/baselines/main.json
+    python benchmarks/bench_suite.py compare benchmarks/baselines/main.json --threshold 0.2
+    python benchmarks/bench_suite.py compare old.json new.json
+
+compare exits with status 1 if anything regressed.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+PAGES = ["Login", "Signup", "Home", "Dashboard", "Insights", "Profile", "Feedback"]
+
+
+def _metric(results, name, value, unit="ms", better="lower"):
+    results[name] = {"value": round(float(value), 4), "unit": unit, "better": better}
+
+
+def _latencies(fn, n):
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.percentile(samples, 50), np.percentile(samples, 95)
+
+
+# ---------------- auth ----------------
+def make_user_table(path, n, stored_hash):
+    """A users.db with n synthetic users sharing one password hash, written in bulk."""
+    from user_store import SQLiteUserStore
+
+    SQLiteUserStore(path)  # creates the schema
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO users (email, password) VALUES (?, ?)",
+            ((f"user{i}@example.com", stored_hash) for i in range(n)),
+        )
+    conn.close()
+
+
+def bench_auth(results, sizes, repeat, clients):
+    import importlib
+
+    import passwords
+    stored = passwords.hash_password("pw")
+    for n in sizes:
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, "users.db")
+        make_user_table(path, n, stored)
+        os.environ["USERS_DB_PATH"] = path
+        import auth_module
+        auth_module = importlib.reload(auth_module)
+
+        p50, p95 = _latencies(lambda i: auth_module.signup(f"new{i}@example.com", "pw"), repeat)
+        _metric(results, f"auth.signup.p50[users={n}]", p50)
+        _metric(results, f"auth.signup.p95[users={n}]", p95)
+        p50, p95 = _latencies(lambda i: auth_module.login(f"user{(i * 7919) % n}@example.com", "pw"), repeat)
+        _metric(results, f"auth.login.p50[users={n}]", p50)
+        _metric(results, f"auth.login.p95[users={n}]", p95)
+
+        done = []
+
+        def client(c):
+            count = 0
+            for i in range(repeat):
+                ok, _ = auth_module.login(f"user{(c * repeat + i) % n}@example.com", "pw")
+                count += ok
+            done.append(count)
+
+        threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        _metric(results, f"auth.login.throughput[users={n}]", sum(done) / (time.perf_counter() - start), "ops/s", "higher")
+        print(f"auth: {n} users done")
+
+
+# ---------------- pages ----------------
+def ensure_dataset():
+    if os.environ.get("INCOME_DATA_DIR"):
+        return
+    tmp = tempfile.mkdtemp()
+    csv_path = os.path.join(tmp, "income.csv")
+    env = dict(os.environ, INCOME_DATA_DIR=os.path.join(tmp, "data"))
+    subprocess.run([sys.executable, os.path.join(APP_DIR, "benchmarks", "synthetic_income_csv.py"), csv_path],
+                   check=True, stdout=subprocess.DEVNULL)
+    subprocess.run([sys.executable, os.path.join(APP_DIR, "ingest.py"), csv_path],
+                   check=True, env=env, stdout=subprocess.DEVNULL)
+    os.environ["INCOME_DATA_DIR"] = env["INCOME_DATA_DIR"]
+
+
+def bench_pages(results, repeat):
+    import dashboard_snapshots
+    import lottie_cache
+    lottie_cache.get_lottie = lambda url: {}
+    dashboard_snapshots.refresh()  # the Dashboard opens on its snapshots, as it would in production
+    from streamlit.testing.v1 import AppTest
+
+    for page in PAGES:
+        at = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=120)
+        if page == "Signup":
+            at.session_state.mode = "Signup"
+        elif page != "Login":
+            at.session_state.logged_in = True
+            at.session_state.page = page
+        at.run()  # first run pays for imports and cold caches
+        if at.exception:
+            raise RuntimeError(f"{page} page failed: {at.exception[0].value}")
+        p50, p95 = _latencies(lambda i: at.run(), repeat)
+        _metric(results, f"page.{page}.p50", p50)
+        _metric(results, f"page.{page}.p95", p95)
+        print(f"page: {page} {p50:.1f} ms")
+
+
+# ---------------- baselines ----------------
+def run(args):
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)  # session, engagement and feedback stores land here, not in the repo
+    os.environ.setdefault("PASSWORD_SCRYPT_N", str(args.scrypt_n))
+    os.environ.setdefault("LOTTIE_WARMUP", "0")
+    # Admission control would (rightly) throttle a benchmark hammering login
+    for name in ("LOGIN_EMAIL", "LOGIN_CLIENT"):
+        os.environ.setdefault(f"{name}_RATE", "1e9")
+        os.environ.setdefault(f"{name}_BURST", "1e9")
+    os.environ.setdefault("LOGIN_MAX_CONCURRENT", "1000")
+
+    results = {}
+    if "auth" in args.only:
+        bench_auth(results, args.sizes, args.repeat, args.clients)
+    if "pages" in args.only:
+        ensure_dataset()
+        bench_pages(results, args.page_repeat)
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scrypt_n": int(os.environ["PASSWORD_SCRYPT_N"]),
+        },
+        "results": results,
+    }
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+    return report
+
+
+def compare(baseline, current, threshold):
+    """Print a table of every shared metric; returns the names that regressed."""
+    regressions = []
+    print(f"{'metric':<40} | {'baseline':>10} | {'current':>10} | {'change':>7}")
+    for name, base in sorted(baseline["results"].items()):
+        cur = current["results"].get(name)
+        if cur is None or not base["value"]:
+            continue
+        change = cur["value"] / base["value"] - 1
+        worse = change if base["better"] == "lower" else -change
+        flag = "  REGRESSION" if worse > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<40} | {base['value']:>10.3f} | {cur['value']:>10.3f} | {change:>+6.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("run", "compare"):
+        p = sub.add_parser(name)
+        if name == "compare":
+            p.add_argument("baseline")
+            p.add_argument("current", nargs="?", help="results JSON to compare (default: run the suite now)")
+            p.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 = 20%%")
+        p.add_argument("--out", help="write results JSON here")
+        p.add_argument("--only", nargs="+", choices=["auth", "pages"], default=["auth", "pages"])
+        p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+        p.add_argument("--repeat", type=int, default=200, help="auth calls per measurement")
+        p.add_argument("--clients", type=int, default=4)
+        p.add_argument("--page-repeat", type=int, default=10)
+        p.add_argument("--scrypt-n", type=int, default=16)
+    args = parser.parse_args()
+    if args.out:
+        args.out = os.path.abspath(args.out)  # run() changes directory
+
+    if args.command == "run":
+        run(args)
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run(args)
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
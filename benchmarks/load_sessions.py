@@ -0,0 +1,229 @@
+"""Multi-session load test: how many concurrent users one app.py process can serve.
+
+Starts `streamlit run app.py` headless on a free port and connects N
+simulated browsers to its websocket, speaking Streamlit's own BackMsg /
+ForwardMsg protocol. Each one walks the flow login -> Home -> Dashboard ->
+Feedback (submit) -> logout, --flows times. Every step sends the widget
+states a real click would and is timed until the script run finishes,
+including any st.rerun() it triggers. For each N in --sessions it reports:
+
+    reruns/s      completed reruns per second across all sessions
+    p50/p95/p99   rerun latency in ms, as seen by the client
+    RSS           server resident memory with all N sessions connected,
+                  and the increase over the idle server per session
+
+(AppTest cannot stand in for the server here: it swaps a mock into the
+global Runtime for each run, so instances on several threads trip over
+each other.)
+
+The server runs in a temporary directory with a synthetic dataset, a
+pre-seeded Lottie cache (no network) and PASSWORD_SCRYPT_N=1024 unless set.
+Admission limits are lifted, since every simulated user comes from
+127.0.0.1. Usage:
+
+    python benchmarks/load_sessions.py --sessions 1 2 4 8 16 --flows 3
+"""
+import argparse
+import asyncio
+import glob
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import APP_DIR, ensure_dataset  # noqa: E402
+
+EARLY_FOR_RERUN = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+class Browser:
+    """One simulated user on its own websocket session."""
+
+    def __init__(self, url, email):
+        self.url = url
+        self.email = email
+        self.ws = None
+        self.query_string = ""
+        self.widgets = {}  # widget key (or label, if unkeyed) -> element id
+        self.fragments = {}  # widget key -> id of the fragment it was drawn in ("" = none)
+        self.values = {}  # widget key -> WidgetState last set, resent on every rerun as the browser does
+        self.latencies = []
+        self.errors = 0
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, max_size=None)
+
+    async def _run(self, clicks=(), **values):
+        """Rerun after clicking `clicks` (button keys) with the given widget values; wait until it finishes.
+
+        Like the browser, only the enclosing fragment is rerun if every widget involved sits in the same one.
+        """
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        for key in clicks:
+            msg.rerun_script.widget_states.widgets.append(WidgetState(id=self.widgets[key], trigger_value=True))
+        for key, value in values.items():
+            w = WidgetState(id=self.widgets[key])
+            if isinstance(value, bool):
+                w.bool_value = value
+            else:
+                w.string_value = value
+            self.values[key] = w
+        msg.rerun_script.widget_states.widgets.extend(self.values.values())
+        fragments = {self.fragments[key] for key in [*clicks, *values]}
+        if len(fragments) == 1:
+            msg.rerun_script.fragment_id = fragments.pop()
+        self.bytes_received = 0
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            data = await self.ws.recv()
+            self.bytes_received += len(data)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    self.errors += 1
+                widget = getattr(element, element.WhichOneof("type") or "empty")
+                element_id = getattr(widget, "id", "")
+                if element_id.startswith("$$ID"):
+                    key = element_id.rsplit("-", 1)[-1]
+                    if key == "None":  # no key= given, e.g. a form's submit button: use its label
+                        key = widget.label
+                    self.widgets[key] = element_id
+                    self.fragments[key] = fwd.delta.fragment_id
+            elif kind == "page_info_changed":
+                self.query_string = fwd.page_info_changed.query_string
+            elif kind == "script_finished" and fwd.script_finished != EARLY_FOR_RERUN:
+                break
+        self.latencies.append((time.perf_counter() - start) * 1000)
+
+    async def flow(self):
+        await self._run()  # open the app on the login screen
+        await self._run(["login_btn"], login_email=self.email, login_password="pw")
+        for page in ("Home", "Dashboard", "Feedback"):
+            await self._run([f"sidebar_{page}"])
+        await self._run(["submit_feedback_btn"], feedback_text=f"Load test feedback from {self.email}")
+        await self._run(["sidebar_Logout"])
+
+
+async def run_level(url, pid, n, flows):
+    browsers = [Browser(url, f"load{i}@example.com") for i in range(n)]
+    await asyncio.gather(*(b.connect() for b in browsers))
+
+    async def drive(b):
+        for _ in range(flows):
+            await b.flow()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(b) for b in browsers))
+    elapsed = time.perf_counter() - start
+    rss = rss_mb(pid)  # every session is still connected
+    await asyncio.gather(*(b.ws.close() for b in browsers))
+    latencies = np.concatenate([b.latencies for b in browsers])
+    return {
+        "reruns_per_s": len(latencies) / elapsed,
+        "p50": np.percentile(latencies, 50),
+        "p95": np.percentile(latencies, 95),
+        "p99": np.percentile(latencies, 99),
+        "rss": rss,
+        "errors": sum(b.errors for b in browsers),
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed_lottie_cache(app_dir, cache_dir):
+    """Pre-seed the Lottie disk cache with every *_LOTTIE_URL in the app, so no page touches the network."""
+    os.environ["LOTTIE_CACHE_DIR"] = cache_dir
+    sys.path.insert(0, app_dir)
+    import lottie_cache
+    for path in [os.path.join(app_dir, "app.py"), *glob.glob(os.path.join(app_dir, "views", "*.py"))]:
+        with open(path) as f:
+            for url in re.findall(r'_LOTTIE_URL = "([^"]+)"', f.read()):
+                lottie_cache._write_disk({"url": url, "fetched_at": time.time() + 10 ** 9, "data": {}})
+
+
+def start_server(workdir, port, env, app=os.path.join(APP_DIR, "app.py")):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app,
+         "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit server did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--flows", type=int, default=3, help="flows per session")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)  # user, session, feedback and engagement stores land here
+    ensure_dataset()
+    env = dict(os.environ, LOTTIE_WARMUP="0", LOTTIE_CACHE_DIR=os.path.join(workdir, "lottie"))
+    env.setdefault("PASSWORD_SCRYPT_N", "1024")
+    for name in ("LOGIN_EMAIL", "LOGIN_CLIENT"):
+        env[f"{name}_RATE"] = env[f"{name}_BURST"] = "1e9"
+    env["LOGIN_MAX_CONCURRENT"] = "1000"
+
+    seed_lottie_cache(APP_DIR, env["LOTTIE_CACHE_DIR"])
+    import dashboard_snapshots
+    dashboard_snapshots.refresh()  # the server's job then finds them fresh and leaves them be
+
+    os.environ["PASSWORD_SCRYPT_N"] = env["PASSWORD_SCRYPT_N"]
+    import auth_module
+    for i in range(max(args.sessions)):
+        auth_module.signup(f"load{i}@example.com", "pw")
+
+    port = free_port()
+    server = start_server(workdir, port, env)
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    try:
+        asyncio.run(run_level(url, server.pid, 1, 1))  # warm imports and caches
+        base_rss = rss_mb(server.pid)
+        print(f"{'sessions':>8} | {'reruns/s':>8} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7} | {'RSS MB':>7} | {'MB/session':>10} | errors")
+        for n in args.sessions:
+            r = asyncio.run(run_level(url, server.pid, n, args.flows))
+            per_session = (r["rss"] - base_rss) / n
+            print(f"{n:>8} | {r['reruns_per_s']:>8.1f} | {r['p50']:>7.1f} | {r['p95']:>7.1f} | {r['p99']:>7.1f} | "
+                  f"{r['rss']:>7.1f} | {per_session:>10.2f} | {r['errors']}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Write a synthetic World Bank-style income CSV for benchmarks and local runs.
+
+One row per country-year with region, income group, population and decile1..
+decile10 income shares drawn from a lognormal model. Usage:
+
+    python benchmarks/synthetic_income_csv.py out.csv [--countries 217] [--years 1960 2023]
+    python ingest.py out.csv
+"""
+import argparse
+import csv
+
+import numpy as np
+
+REGIONS = [
+    "East Asia & Pacific", "Europe & Central Asia", "Latin America & Caribbean",
+    "Middle East & North Africa", "North America", "South Asia", "Sub-Saharan Africa",
+]
+INCOME_GROUPS = ["Low income", "Lower middle income", "Upper middle income", "High income"]
+
+
+def decile_shares(rng, sigma, draws=2000):
+    incomes = np.sort(rng.lognormal(0.0, sigma, size=draws))
+    shares = incomes.reshape(10, -1).sum(axis=1)
+    return shares / shares.sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out")
+    parser.add_argument("--countries", type=int, default=217)
+    parser.add_argument("--years", type=int, nargs=2, default=[1960, 2023])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with open(args.out, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["country_code", "country_name", "region", "income_group", "year", "population"]
+                        + [f"decile{i}" for i in range(1, 11)])
+        for c in range(args.countries):
+            code = chr(65 + c // 676) + chr(65 + c // 26 % 26) + chr(65 + c % 26)
+            region = REGIONS[rng.integers(len(REGIONS))]
+            group = INCOME_GROUPS[rng.integers(len(INCOME_GROUPS))]
+            population = rng.uniform(1e5, 1e8)
+            sigma = rng.uniform(0.4, 1.1)
+            for year in range(args.years[0], args.years[1] + 1):
+                sigma = float(np.clip(sigma + rng.normal(0, 0.02), 0.25, 1.4))
+                population *= 1 + rng.normal(0.015, 0.01)
+                writer.writerow([code, f"Country {code}", region, group, year, round(population)]
+                                + [f"{s:.6f}" for s in decile_shares(rng, sigma)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# build_assets.py
+"""Build step: vendor and transcode the remote images listed in assets.py.
+
+    python build_assets.py [--widths 320 640 960] [--quality 70]
+
+For every image this downloads the original once, then writes to
+static/assets/ an animated WebP and a static WebP poster frame per target
+width, named <name>-<width>.<hash>.webp, and records them in manifest.json.
+Images narrower than a target width are never upscaled.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+
+import requests
+from PIL import Image, ImageSequence
+
+from assets import ASSET_DIR, MANIFEST_PATH, REMOTE_IMAGES, WIDTHS
+
+
+def _write_hashed(name, width, kind, data):
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    filename = f"{name}-{width}{kind}.{digest}.webp"
+    with open(os.path.join(ASSET_DIR, filename), "wb") as f:
+        f.write(data)
+    return filename
+
+
+def _resize(frame, width):
+    frame = frame.convert("RGBA")
+    if frame.width <= width:
+        return frame
+    height = round(frame.height * width / frame.width)
+    return frame.resize((width, height), Image.LANCZOS)
+
+
+def transcode(name, source, widths, quality):
+    """Return the manifest entry for one source image (raw GIF bytes)."""
+    image = Image.open(io.BytesIO(source))
+    frames = [frame.copy() for frame in ImageSequence.Iterator(image)]
+    durations = [frame.info.get("duration", image.info.get("duration", 100)) for frame in frames]
+    variants = []
+    for width in sorted(set(min(w, image.width) for w in widths)):
+        resized = [_resize(frame, width) for frame in frames]
+
+        animated = io.BytesIO()
+        resized[0].save(
+            animated, format="WEBP", save_all=True, append_images=resized[1:],
+            duration=durations, loop=0, quality=quality, method=6,
+        )
+        poster = io.BytesIO()
+        resized[0].save(poster, format="WEBP", quality=quality, method=6)
+
+        variants.append({
+            "width": width,
+            "animated": _write_hashed(name, width, "", animated.getvalue()),
+            "poster": _write_hashed(name, width, "-poster", poster.getvalue()),
+            "bytes": len(animated.getvalue()),
+        })
+    return {"source_bytes": len(source), "variants": variants}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--widths", type=int, nargs="+", default=list(WIDTHS))
+    parser.add_argument("--quality", type=int, default=70)
+    args = parser.parse_args()
+
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    manifest = {}
+    for name, url in REMOTE_IMAGES.items():
+        r = requests.get(url, timeout=(3.05, 60))
+        r.raise_for_status()
+        manifest[name] = transcode(name, r.content, args.widths, args.quality)
+        sizes = ", ".join(f"{v['width']}px {v['bytes'] // 1024} KB" for v in manifest[name]["variants"])
+        print(f"{name}: {len(r.content) // 1024} KB GIF -> {sizes}")
+
+    # Drop files from earlier builds that the new manifest no longer references
+    keep = {"manifest.json"}
+    for entry in manifest.values():
+        for v in entry["variants"]:
+            keep.update((v["animated"], v["poster"]))
+    for filename in os.listdir(ASSET_DIR):
+        if filename not in keep:
+            os.remove(os.path.join(ASSET_DIR, filename))
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# build_geometry.py
+"""Build step: pre-simplified, quantized TopoJSON world geometries for the choropleth.
+
+    python build_geometry.py ne_50m_admin_0_countries.geojson [--id-property ISO_A3] [--name-property NAME]
+
+The source is any GeoJSON FeatureCollection of country (Multi)Polygons, e.g.
+Natural Earth admin-0. Borders shared by two countries are extracted once as
+TopoJSON arcs, so simplification never opens gaps between neighbours. Each
+level in LEVELS is simplified with Douglas-Peucker at its tolerance,
+quantized and delta-encoded, then written to static/geo/ under a
+content-hashed name, with a manifest.json for geo_cache.py to choose from.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from geo_cache import GEO_DIR, LEVELS, MANIFEST_PATH
+
+
+# ---------------- Topology ----------------
+def _rings(geometry):
+    """Yield (polygon index, closed point list without the repeated last point) per ring."""
+    polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+    for p, polygon in enumerate(polygons):
+        for ring in polygon:
+            points = [tuple(pt[:2]) for pt in ring]
+            if len(points) > 1 and points[0] == points[-1]:
+                points.pop()
+            if len(points) >= 3:
+                yield p, points
+
+
+def build_topology(features, id_property, name_property):
+    """Split every ring into arcs at the points where its neighbour changes.
+
+    Returns (arcs, geometries): arcs is a list of point lists; each geometry
+    references arcs by index, with ~i meaning arc i reversed.
+    """
+    rings = []  # (feature index, polygon index, points)
+    edge_owners = {}
+    for f, feature in enumerate(features):
+        for p, points in _rings(feature["geometry"]):
+            ring_id = len(rings)
+            rings.append((f, p, points))
+            for a, b in zip(points, points[1:] + points[:1]):
+                edge_owners.setdefault(frozenset((a, b)), set()).add(ring_id)
+
+    arcs, arc_ids = [], {}
+
+    def arc_index(points):
+        key = tuple(points)
+        if key in arc_ids:
+            return arc_ids[key]
+        if key[::-1] in arc_ids:
+            return ~arc_ids[key[::-1]]
+        arc_ids[key] = len(arcs)
+        arcs.append(list(points))
+        return arc_ids[key]
+
+    geometries = {}
+    for f, p, points in rings:
+        n = len(points)
+        owners = [frozenset(edge_owners[frozenset((points[i], points[(i + 1) % n]))]) for i in range(n)]
+        cuts = [i for i in range(n) if owners[i] != owners[i - 1]]
+        if not cuts:
+            # A ring with one neighbour all the way round: one closed arc, canonically rotated
+            start = min(range(n), key=lambda i: points[i])
+            rotated = points[start:] + points[:start]
+            refs = [arc_index(rotated + rotated[:1])]
+        else:
+            refs = []
+            for k, start in enumerate(cuts):
+                stop = cuts[(k + 1) % len(cuts)]
+                piece = points[start:stop + 1] if stop > start else points[start:] + points[:stop + 1]
+                refs.append(arc_index(piece))
+        geometries.setdefault(f, {}).setdefault(p, []).append(refs)
+
+    objects = []
+    for f, feature in enumerate(features):
+        props = feature.get("properties") or {}
+        polygons = [geometries[f][p] for p in sorted(geometries.get(f, {}))]
+        if not polygons:
+            continue
+        geometry = {"id": props.get(id_property), "properties": {"name": props.get(name_property)}}
+        if len(polygons) == 1:
+            geometry.update(type="Polygon", arcs=polygons[0])
+        else:
+            geometry.update(type="MultiPolygon", arcs=polygons)
+        objects.append(geometry)
+    return arcs, objects
+
+
+# ---------------- Simplification & encoding ----------------
+def simplify(points, tolerance):
+    """Douglas-Peucker on one arc; the endpoints (junctions) are always kept."""
+    pts = np.asarray(points, dtype=float)
+    n = len(pts)
+    if n <= 2 or tolerance <= 0:
+        return pts
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        seg = pts[b] - pts[a]
+        rel = pts[a + 1:b] - pts[a]
+        length = np.hypot(*seg)
+        if length == 0:  # closed arc: distance from the start point
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            keep[a + 1 + i] = True
+            stack.extend(((a, a + 1 + i), (a + 1 + i, b)))
+    if pts[0].tolist() == pts[-1].tolist() and keep.sum() < 4:
+        # Keep closed rings a valid polygon instead of collapsing them
+        keep[[n // 3, 2 * n // 3]] = True
+    return pts[keep]
+
+
+def encode(arcs, objects, tolerance, quantization):
+    all_points = np.concatenate([np.asarray(a, dtype=float) for a in arcs])
+    lo, hi = all_points.min(axis=0), all_points.max(axis=0)
+    scale = (hi - lo) / (quantization - 1)
+    scale[scale == 0] = 1.0
+    encoded = []
+    for arc in arcs:
+        q = np.round((simplify(arc, tolerance) - lo) / scale).astype(np.int64)
+        # Drop points that quantize onto their predecessor, keeping at least the two ends
+        distinct = np.r_[True, np.any(np.diff(q, axis=0) != 0, axis=1)]
+        distinct[-1] = True
+        q = q[distinct]
+        delta = np.vstack([q[:1], np.diff(q, axis=0)])
+        encoded.append(delta.tolist())
+    return {
+        "type": "Topology",
+        "transform": {"scale": scale.tolist(), "translate": lo.tolist()},
+        "objects": {"countries": {"type": "GeometryCollection", "geometries": objects}},
+        "arcs": encoded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("geojson")
+    parser.add_argument("--id-property", default="ISO_A3", help="feature property holding the ISO3 country code")
+    parser.add_argument("--name-property", default="NAME")
+    args = parser.parse_args()
+
+    with open(args.geojson) as f:
+        features = json.load(f)["features"]
+    arcs, objects = build_topology(features, args.id_property, args.name_property)
+
+    os.makedirs(GEO_DIR, exist_ok=True)
+    manifest = {}
+    for level, (tolerance, quantization, _) in LEVELS.items():
+        data = json.dumps(encode(arcs, objects, tolerance, quantization), separators=(",", ":")).encode()
+        filename = f"world-{level}.{hashlib.sha256(data).hexdigest()[:12]}.json"
+        with open(os.path.join(GEO_DIR, filename), "wb") as f:
+            f.write(data)
+        manifest[level] = filename
+        print(f"{level}: {len(objects)} countries, {len(arcs)} arcs, {len(data) // 1024} KB")
+
+    for filename in os.listdir(GEO_DIR):
+        if filename != "manifest.json" and filename not in manifest.values():
+            os.remove(os.path.join(GEO_DIR, filename))
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
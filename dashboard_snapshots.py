@@ -0,0 +1,200 @@
+# dashboard_snapshots.py
+"""Pre-rendered Dashboard charts, so the page has something to show at once.
+
+A background job renders the Dashboard's native charts at their default
+settings to self-contained Vega-Lite specs, with the data inlined, and
+writes each one gzip-compressed to SNAPSHOT_DIR. The page draws these
+without computing anything. It builds the interactive charts, or loads the
+remote Power BI iframe, only when the user asks for them.
+
+    SNAPSHOT_DIR        where snapshots are kept (default "snapshots")
+    SNAPSHOT_INTERVAL   seconds between refreshes (default 900, 0 = no background job)
+
+The job starts with the first Dashboard visit in a process, not at app
+start, so Login and the other pages never import pyarrow or Altair for it.
+Snapshots are refreshed by age, read from the files themselves, so a
+restarted process, or a second one sharing the directory, does not redo a
+fresh snapshot. `python dashboard_snapshots.py` renders them all once,
+e.g. from cron with SNAPSHOT_INTERVAL=0 on the app.
+"""
+import gzip
+import json
+import math
+import os
+import threading
+import time
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "snapshots")
+INTERVAL = float(os.environ.get("SNAPSHOT_INTERVAL", "900"))
+
+
+# ---------------- Rendering ----------------
+def _line_chart(rows, x, y, color, width):
+    import altair as alt
+
+    return (
+        alt.Chart(alt.Data(values=rows))
+        .mark_line()
+        .encode(x=alt.X(f"{x}:Q", axis=alt.Axis(format="d")), y=f"{y}:Q", color=f"{color}:N")
+        .properties(width=width)
+    )
+
+
+def _comparison():
+    import aggregate_cube
+    import inequality_metrics
+    from dashboard_views import CHART_WIDTH_PX, METRIC_LABELS, group_comparison
+
+    metric = next(iter(inequality_metrics.METRICS))
+    data = group_comparison(metric, "region", "year")  # shared with the live chart's cache: read only
+    label = METRIC_LABELS[metric]
+    rows = [
+        {"Year": year, label: float(value), "Region": region}
+        for region, values in data.items() if region != "Year"
+        for year, value in zip(data["Year"], values)
+        if value is not None and not math.isnan(value)
+    ]
+    first, last = aggregate_cube.year_range()
+    return ("Regional & Income-Group Comparison", f"{label} by region, {first}–{last}",
+            _line_chart(rows, "Year", label, "Region", CHART_WIDTH_PX))
+
+
+def _trajectories():
+    import aggregate_cube
+    import inequality_metrics
+    from dashboard_views import CHART_WIDTH_PX, METRIC_LABELS, trajectory_points
+    from income_store import get_income_store
+
+    metric = next(iter(inequality_metrics.METRICS))
+    countries = tuple(get_income_store().countries()[:5])
+    data = trajectory_points(metric, countries, aggregate_cube.year_range())
+    label = METRIC_LABELS[metric]
+    rows = [
+        {"Year": float(x), label: float(y), "Country": country}
+        for x, y, country in zip(data["x"], data["y"], data["series"])
+    ]
+    return ("Country Trajectories", f"{label} for {', '.join(countries)}",
+            _line_chart(rows, "Year", label, "Country", CHART_WIDTH_PX))
+
+
+def _map():
+    import aggregate_cube
+    import inequality_metrics
+    from dashboard_views import MAP_WIDTH_PX, METRIC_LABELS, choropleth_chart
+    from geo_cache import topojson_url
+
+    url = topojson_url(MAP_WIDTH_PX)
+    if url is None:
+        return None
+    metric = next(iter(inequality_metrics.METRICS))
+    year = aggregate_cube.year_range()[1]
+    return "World Inequality Map", f"{METRIC_LABELS[metric]} in {year}", choropleth_chart(metric, year, url)
+
+
+# name -> builder returning (title, caption, Altair chart) or None; drawn in this order
+SNAPSHOTS = {"map": _map, "comparison": _comparison, "trajectories": _trajectories}
+
+
+def _path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.json.gz")
+
+
+def _age(name, now):
+    try:
+        return now - os.path.getmtime(_path(name))
+    except OSError:
+        return math.inf
+
+
+def refresh(force=False):
+    """Render every snapshot that is missing or older than INTERVAL. Returns the names written."""
+    from income_store import get_income_store
+
+    if get_income_store() is None:
+        return []
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    written = []
+    for name, build in SNAPSHOTS.items():
+        if not force and _age(name, time.time()) < INTERVAL:
+            continue
+        built = build()
+        if built is None:
+            continue
+        title, caption, chart = built
+        record = {"title": title, "caption": caption, "taken_at": time.time(), "spec": chart.to_dict()}
+        tmp = f"{_path(name)}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(record, f, separators=(",", ":"))
+        os.replace(tmp, _path(name))  # readers see the old snapshot or the new one, never half of one
+        written.append(name)
+    return written
+
+
+# ---------------- Reading ----------------
+_loaded = {}  # name -> (mtime, record)
+_loaded_lock = threading.Lock()
+
+
+def load_snapshots():
+    """[{"title", "caption", "taken_at", "spec"}] for every snapshot on disk, in page order.
+
+    Files are decompressed once per version and then served from memory.
+    """
+    snapshots = []
+    for name in SNAPSHOTS:
+        try:
+            mtime = os.path.getmtime(_path(name))
+        except OSError:
+            continue
+        with _loaded_lock:
+            cached = _loaded.get(name)
+        if cached is None or cached[0] != mtime:
+            with gzip.open(_path(name), "rt", encoding="utf-8") as f:
+                cached = (mtime, json.load(f))
+            with _loaded_lock:
+                _loaded[name] = cached
+        snapshots.append(cached[1])
+    return snapshots
+
+
+def format_age(seconds):
+    """'just now', '5 min ago', '3 h ago', '2 days ago'"""
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h ago"
+    return f"{int(seconds // 86400)} days ago"
+
+
+# ---------------- Background job ----------------
+_job = None
+_job_lock = threading.Lock()
+
+
+def _run_job():
+    while True:
+        try:
+            refresh()
+        except Exception as e:  # keep the last good snapshots and try again next round
+            print("❌ Dashboard snapshot failed:", e)
+        now = time.time()
+        ages = [age for age in (_age(name, now) for name in SNAPSHOTS) if math.isfinite(age)]
+        time.sleep(max(5.0, INTERVAL - max(ages)) if ages else INTERVAL)
+
+
+def start_snapshot_job():
+    """Start the refresh thread once per process (a no-op if SNAPSHOT_INTERVAL=0)."""
+    global _job
+    if INTERVAL <= 0:
+        return
+    with _job_lock:
+        if _job is None:
+            _job = threading.Thread(target=_run_job, name="dashboard-snapshots", daemon=True)
+            _job.start()
+
+
+if __name__ == "__main__":
+    names = refresh(force=True)
+    print(f"Wrote {len(names)} snapshots to {SNAPSHOT_DIR}: {', '.join(names) or 'no dataset ingested'}")
@@ -0,0 +1,175 @@
+# dashboard_views.py
+"""Native (in-process) views for the Dashboard page, built on the local dataset.
+
+Each render_* section is an st.fragment, so changing one chart's controls
+reruns that section and nothing else on the page.
+"""
+import altair as alt
+import pyarrow as pa
+import streamlit as st
+
+import aggregate_cube
+import inequality_metrics
+from downsample import downsample_series
+from geo_cache import topojson_url
+from income_store import get_income_store
+from result_cache import cached_result
+
+METRIC_LABELS = {
+    "gini": "Gini",
+    "theil_t": "Theil T",
+    "theil_l": "Theil L",
+    "atkinson": f"Atkinson (ε={inequality_metrics.ATKINSON_EPSILON})",
+    "top10_share": "Top 10% share",
+    "bottom40_share": "Bottom 40% share",
+    "palma": "Palma ratio",
+}
+
+CHART_WIDTH_PX = 900  # width the trajectory chart is laid out for; sets the point budget
+MAP_WIDTH_PX = 900  # choropleth width; picks the geometry simplification level
+
+
+def render_missing_dataset():
+    st.info("No income dataset ingested yet. Run `python ingest.py <export.csv>` to enable native charts.")
+
+
+@st.fragment
+def render_country_metrics():
+    """Inequality metrics by year for one country."""
+    store = get_income_store()
+    if store is None:
+        render_missing_dataset()
+        return
+    st.subheader("Inequality Metrics by Country")
+    country = st.selectbox("Country", store.countries(), key="metrics_country")
+    st.dataframe(country_metrics(country), hide_index=True, use_container_width=True)
+
+
+@cached_result("country_metrics")
+def country_metrics(country):
+    store = get_income_store()
+    rows = store.rows(country)
+    metrics = inequality_metrics.all_metrics(store.group_matrix(rows))
+    return pa.table({"Year": rows.column("year"), **{METRIC_LABELS[k]: metrics[k] for k in inequality_metrics.METRICS}})
+
+
+@st.fragment
+def render_group_comparison():
+    """Population-weighted metric trends by region or income group, served from the aggregate cube."""
+    if get_income_store() is None:
+        render_missing_dataset()
+        return
+    st.subheader("Regional & Income-Group Comparison")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metric = st.selectbox("Metric", list(inequality_metrics.METRICS),
+                              format_func=METRIC_LABELS.get, key="compare_metric")
+    with col2:
+        dimension = st.selectbox("Compare", ["region", "income_group"],
+                                 format_func={"region": "Regions", "income_group": "Income groups"}.get,
+                                 key="compare_dimension")
+    with col3:
+        period_type = st.selectbox("Period", ["year", "decade"], format_func=str.title, key="compare_period")
+
+    data = group_comparison(metric, dimension, period_type)
+    st.line_chart(data, x=period_type.title(), y=[k for k in data if k != period_type.title()])
+
+
+@cached_result("group_comparison")
+def group_comparison(metric, dimension, period_type):
+    """{period column: periods, group: values, ..., "World": values} for a line chart."""
+    first, last = aggregate_cube.year_range()
+    periods = list(range(first, last + 1) if period_type == "year" else range(first // 10 * 10, last + 1, 10))
+    data = {period_type.title(): periods}
+    for value in aggregate_cube.dimension_values(dimension):
+        filters = {dimension: value}
+        data[value] = aggregate_cube.series(metric, periods, period_type=period_type, **filters)
+    data["World"] = aggregate_cube.series(metric, periods, period_type=period_type)
+    return data
+
+
+@st.fragment
+def render_trajectories():
+    """Metric trajectories for many countries, LTTB-downsampled to the chart width."""
+    store = get_income_store()
+    if store is None:
+        render_missing_dataset()
+        return
+    st.subheader("Country Trajectories")
+    first, last = aggregate_cube.year_range()
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        metric = st.selectbox("Metric", list(inequality_metrics.METRICS),
+                              format_func=METRIC_LABELS.get, key="trajectory_metric")
+        all_countries = st.checkbox("All countries", key="trajectory_all")
+    with col2:
+        countries = st.multiselect("Countries", store.countries(), default=store.countries()[:5],
+                                   key="trajectory_countries", disabled=all_countries)
+        # Narrowing the range zooms in: LTTB re-runs on the visible years only
+        years = st.slider("Years", first, last, (first, last), key="trajectory_years")
+    selected = tuple(store.countries()) if all_countries else tuple(countries)
+    if not selected:
+        return
+    data = trajectory_points(metric, selected, years)
+    label = METRIC_LABELS[metric]
+    st.line_chart({"Year": data["x"], label: data["y"], "Country": data["series"]},
+                  x="Year", y=label, color="Country", width=CHART_WIDTH_PX)
+    st.caption(f"{len(data['series'])} points plotted for {len(selected)} countries")
+
+
+@cached_result("trajectory_points")
+def trajectory_points(metric, countries, years):
+    series = {}
+    for country in countries:
+        table = country_metrics(country)
+        series[country] = (table.column("Year").to_numpy(), table.column(METRIC_LABELS[metric]).to_numpy())
+    return downsample_series(series, CHART_WIDTH_PX, x_range=years)
+
+
+@st.fragment
+def render_choropleth():
+    """World map of one metric in one year over cached, pre-simplified TopoJSON."""
+    if get_income_store() is None:
+        render_missing_dataset()
+        return
+    st.subheader("World Inequality Map")
+    url = topojson_url(MAP_WIDTH_PX)
+    if url is None:
+        st.info("World geometries not built yet. Run `python build_geometry.py <countries.geojson>`.")
+        return
+    first, last = aggregate_cube.year_range()
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        metric = st.selectbox("Metric", list(inequality_metrics.METRICS),
+                              format_func=METRIC_LABELS.get, key="map_metric")
+    with col2:
+        year = st.slider("Year", first, last, last, key="map_year")
+    st.altair_chart(choropleth_chart(metric, year, url))
+
+
+def choropleth_chart(metric, year, url):
+    """The world map as an Altair chart (also rendered ahead of time by dashboard_snapshots.py)."""
+    label = METRIC_LABELS[metric]
+    # Geometry is fetched by the browser from the static URL (and cached there);
+    # only the per-country values travel with each render.
+    return (
+        alt.Chart(alt.topo_feature(url, "countries"))
+        .mark_geoshape(stroke="white", strokeWidth=0.3)
+        .transform_lookup(lookup="id", from_=alt.LookupData(alt.Data(values=map_values(metric, year)), "id", ["value"]))
+        .encode(
+            color=alt.Color("value:Q", title=label, scale=alt.Scale(scheme="viridis")),
+            tooltip=[alt.Tooltip("properties.name:N", title="Country"), alt.Tooltip("value:Q", title=label, format=".3f")],
+        )
+        .project("equalEarth")
+        .properties(width=MAP_WIDTH_PX, height=MAP_WIDTH_PX // 2)
+    )
+
+
+@cached_result("map_values")
+def map_values(metric, year):
+    """[{"id": country code, "value": metric}] for every country with data in `year`."""
+    store = get_income_store()
+    rows = store.rows(year_from=year, year_to=year)
+    values = inequality_metrics.all_metrics(store.group_matrix(rows))[metric]
+    codes = rows.column("country_code").to_pylist()
+    return [{"id": code, "value": float(v)} for code, v in zip(codes, values) if v == v]
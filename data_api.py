@@ -0,0 +1,261 @@
+# data_api.py
+"""Read-only HTTP/JSON API for the inequality figures behind the Dashboard.
+
+    GET /v1/countries
+        {"version", "countries": [{"country", "name", "region", "income_group", "first_year", "last_year"}]}
+    GET /v1/metrics?country=AAA,AAB | region=...  [&from=1990&to=2020] [&metric=gini,palma]
+        Per country-year metrics: {"version", "rows": [{"country", "year", "gini", ...}]}
+        (every country when neither country nor region is given; every metric by default)
+    GET /v1/aggregates?metric=gini [&region=All&income_group=All&period=year|decade&from=&to=]
+        Population-weighted series from the aggregate cube: {"version", "metric", "periods", "values"}
+
+from / to are clamped to the years the dataset covers (400 if they miss it
+entirely), and an unknown country, region or income_group is a 400.
+
+Every response carries a weak ETag made from the dataset version, the path
+and the normalized query, so a client repeating a request with
+If-None-Match gets 304 Not Modified until ingest.py publishes a new
+dataset. The ETag is only compared once the request has been validated, so
+a bad request is a 400 whatever it sends. Bodies are built once per
+(request, dataset version) and kept in the shared result cache
+(result_cache.py) next to a gzip copy for clients whose Accept-Encoding
+allows gzip. Missing values are null.
+
+Runs inside the app.py process when DATA_API_PORT is set, or on its own:
+
+    python data_api.py --port 8600
+
+    DATA_API_HOST   interface to bind (default 127.0.0.1)
+    DATA_API_PORT   port to serve on from app.py (default 0 = not served)
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pyarrow as pa
+
+import aggregate_cube
+import inequality_metrics
+from income_store import get_income_store
+from result_cache import cached_result
+from telemetry import span
+
+HOST = os.environ.get("DATA_API_HOST", "127.0.0.1")
+PORT = int(os.environ.get("DATA_API_PORT", "0"))
+API_VERSION = "v1"
+GZIP_MIN_BYTES = 1024  # smaller bodies go out as they are
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _number(value):
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _year(params, name, default):
+    if name not in params:
+        return default
+    try:
+        return int(params[name])
+    except ValueError:
+        raise ApiError(400, f"{name} must be a year, got {params[name]!r}")
+
+
+def _years(params):
+    """Inclusive (from, to) of a request, clamped to the dataset's years; 400 if it misses them all."""
+    first, last = aggregate_cube.year_range()
+    year_from, year_to = max(_year(params, "from", first), first), min(_year(params, "to", last), last)
+    if year_from > year_to:
+        raise ApiError(400, f"No data between from and to: the dataset covers {first}-{last}")
+    return year_from, year_to
+
+
+def _names(params, name, allowed=None):
+    names = [n for n in params.get(name, "").split(",") if n]
+    unknown = [n for n in names if allowed is not None and n not in allowed]
+    if unknown:
+        raise ApiError(400, f"Unknown {name}: {', '.join(unknown)}")
+    return names
+
+
+# ---------------- Routes ----------------
+@cached_result("data_api.countries")
+def _countries():
+    store = get_income_store()
+    table = store.table
+    countries = []
+    for code, (start, stop) in store.country_index.items():
+        first = table.slice(start, 1).to_pylist()[0]
+        countries.append({
+            "country": code,
+            "name": first.get("country_name"),
+            "region": first.get("region") or aggregate_cube.UNKNOWN,
+            "income_group": first.get("income_group") or aggregate_cube.UNKNOWN,
+            "first_year": first["year"],
+            "last_year": table.column("year")[stop - 1].as_py(),
+        })
+    return countries
+
+
+def countries(params):
+    return {"countries": _countries()}
+
+
+def metrics(params):
+    store = get_income_store()
+    wanted = _names(params, "metric", inequality_metrics.METRICS) or list(inequality_metrics.METRICS)
+    codes = _names(params, "country", store.country_index)
+    if "region" in params:
+        codes += [c["country"] for c in _countries() if c["region"] == params["region"]]
+        if not codes:
+            raise ApiError(400, f"Unknown region: {params['region']}")
+    year_from, year_to = _years(params)
+    slices = [store.rows(code, year_from, year_to) for code in codes or store.countries()]
+    table = pa.concat_tables(slices)  # zero-copy: one chunk per country
+    values = inequality_metrics.all_metrics(store.group_matrix(table))  # one vectorized pass for every country
+    columns = {m: [_number(v) for v in values[m].tolist()] for m in wanted}
+    country_column = [code for code, part in zip(codes or store.countries(), slices) for _ in range(part.num_rows)]
+    return {"rows": [
+        {"country": code, "year": year, **{m: columns[m][i] for m in wanted}}
+        for i, (code, year) in enumerate(zip(country_column, table.column("year").to_pylist()))
+    ]}
+
+
+def aggregates(params):
+    metric = params.get("metric")
+    if metric not in (*inequality_metrics.METRICS, "population"):
+        raise ApiError(400, f"metric must be one of {', '.join(inequality_metrics.METRICS)} or population")
+    period_type = params.get("period", "year")
+    if period_type not in aggregate_cube.PERIODS:
+        raise ApiError(400, "period must be year or decade")
+    first, last = _years(params)
+    periods = list(range(first, last + 1) if period_type == "year" else range(first // 10 * 10, last + 1, 10))
+    region = params.get("region", aggregate_cube.ALL)
+    income_group = params.get("income_group", aggregate_cube.ALL)
+    for name, value in (("region", region), ("income_group", income_group)):
+        if value != aggregate_cube.ALL and value not in aggregate_cube.dimension_values(name):
+            raise ApiError(400, f"Unknown {name}: {value}")
+    values = aggregate_cube.series(metric, periods, region, income_group, period_type)
+    return {"metric": metric, "region": region, "income_group": income_group, "period": period_type,
+            "periods": periods, "values": [_number(v) for v in values]}
+
+
+ROUTES = {"/v1/countries": countries, "/v1/metrics": metrics, "/v1/aggregates": aggregates}
+
+
+@cached_result("data_api.response")
+def _response(path, query):
+    """(JSON body, gzip body or None, ETag) for one request; query is its sorted (name, value) pairs."""
+    version = get_income_store().version
+    body = json.dumps({"version": version, **ROUTES[path](dict(query))}, separators=(",", ":")).encode()
+    request = hashlib.sha256(repr((path, query)).encode()).hexdigest()[:16]
+    etag = f'W/"{API_VERSION}-{version}-{request}"'
+    return body, gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None, etag
+
+
+def _accepts_gzip(header):
+    """True if an Accept-Encoding header allows gzip: listed (or matched by *) with a q-value above 0."""
+    weights = {}
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding.lower()] = weight
+    return weights.get("gzip", weights.get("x-gzip", weights.get("*", 0.0))) > 0
+
+
+# ---------------- HTTP ----------------
+class _ApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path not in ROUTES:
+            self._send_error(404, f"No such endpoint: {url.path}")
+            return
+        store = get_income_store()
+        if store is None:
+            self._send_error(503, "No income dataset ingested yet")
+            return
+        try:
+            with span(f"api{url.path.replace('/', '.')}"):
+                # Validates the query; a repeat is served from the result cache, so 304s stay cheap
+                body, gzipped, etag = _response(url.path, tuple(sorted(parse_qsl(url.query))))
+        except ApiError as e:
+            self._send_error(e.status, str(e))
+            return
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self._send_cache_headers(etag)
+        self.send_header("Content-Type", "application/json")
+        if gzipped is not None and _accepts_gzip(self.headers.get("Accept-Encoding", "")):
+            body = gzipped
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cache_headers(self, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")  # always revalidate: a 304 is cheap
+        self.send_header("Vary", "Accept-Encoding")
+
+    def _send_error(self, status, message):
+        body = json.dumps({"error": message}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_api(host=HOST, port=PORT):
+    """Start the API on a background thread once per process (no-op if port is 0 or already running)."""
+    global _server
+    with _server_lock:
+        if _server is not None or not port:
+            return
+        try:
+            _server = ThreadingHTTPServer((host, port), _ApiHandler)
+        except OSError as e:
+            print(f"❌ Data API not started on port {port}:", e)
+            _server = False
+            return
+        threading.Thread(target=_server.serve_forever, name="data-api-http", daemon=True).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the read-only inequality metrics API.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT or 8600)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), _ApiHandler)
+    print(f"Serving on http://{args.host}:{args.port}/v1/")
+    server.serve_forever()
@@ -0,0 +1,72 @@
+# downsample.py
+"""Server-side downsampling for long multi-series line charts.
+
+Largest-Triangle-Three-Buckets (LTTB) keeps the points that matter for the
+shape of a line (peaks, troughs, turns) while dropping the rest. The point
+budget comes from the chart's pixel width and is split across all series, so
+the payload sent to the browser stays roughly constant however many
+countries are selected. Zooming in (a narrower x range) re-runs LTTB on just
+the visible slice, so the same budget buys more detail.
+"""
+import numpy as np
+
+POINTS_PER_PIXEL = 1.0
+MIN_POINTS_PER_SERIES = 3  # first, last and the most prominent turn
+
+
+def lttb_indices(x, y, threshold):
+    """Indices of the `threshold` points LTTB keeps from (x, y), x sorted ascending."""
+    n = len(x)
+    if threshold >= n or n <= 2:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1])
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket boundaries for the n - 2 interior points
+    edges = np.floor(np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        nxt_start, nxt_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_start:nxt_stop].mean()
+        avg_y = y[nxt_start:nxt_stop].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        keep[i + 1] = a
+    return keep
+
+
+def point_budget(width_px, n_series):
+    """Points per series for a chart `width_px` wide showing `n_series` lines."""
+    total = int(width_px * POINTS_PER_PIXEL)
+    return max(MIN_POINTS_PER_SERIES, total // max(n_series, 1))
+
+
+def downsample_series(series, width_px, x_range=None):
+    """Downsample {name: (x, y)} to fit a chart `width_px` wide.
+
+    Only points inside x_range = (lo, hi) are considered, so a zoomed view is
+    refined rather than sliced out of the overview. NaN points are dropped.
+    Returns long-form columns {"x": [...], "y": [...], "series": [...]}.
+    """
+    per_series = point_budget(width_px, len(series))
+    xs, ys, names = [], [], []
+    for name, (x, y) in series.items():
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        mask = ~np.isnan(y)
+        if x_range is not None:
+            mask &= (x >= x_range[0]) & (x <= x_range[1])
+        x, y = x[mask], y[mask]
+        keep = lttb_indices(x, y, per_series)
+        xs.append(x[keep])
+        ys.append(y[keep])
+        names.extend([name] * len(keep))
+    if not xs:
+        return {"x": np.empty(0), "y": np.empty(0), "series": []}
+    return {"x": np.concatenate(xs), "y": np.concatenate(ys), "series": names}
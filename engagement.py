@@ -0,0 +1,258 @@
+# engagement.py
+"""Engagement counters for the Insights page, maintained as events happen.
+
+auth_module records every successful login and signup, and the Feedback
+page (views/feedback.py) records every submission. Each event is appended
+to a compact event log: one (ts, kind, user hash) row, no emails. It also
+updates, in memory, per-day and per-month buckets holding an event count
+and a HyperLogLog sketch of the distinct users. A background thread merges these deltas into
+SQLite every ENGAGEMENT_FLUSH_INTERVAL seconds (counts add, sketch registers
+take the max). Any number of processes can share the file this way.
+
+Insights reads only the ~35 bucket rows it shows and never the event log.
+The log exists so the counters can be rebuilt: python engagement.py --rebuild
+
+    ENGAGEMENT_DB_PATH          SQLite file (default engagement.db)
+    ENGAGEMENT_FLUSH_INTERVAL   seconds between merges (default 2)
+"""
+import argparse
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+KINDS = {"login": 1, "signup": 2, "feedback": 3}
+HLL_P = 12  # 4096 registers, ~1.6% standard error
+
+
+# ---------------- HyperLogLog ----------------
+def user_hash(email):
+    """Stable 64-bit id for an email; the log never stores the address itself."""
+    return int.from_bytes(hashlib.blake2b(email.strip().lower().encode(), digest_size=8).digest(), "big")
+
+
+def hll_add(registers, h):
+    index = h >> (64 - HLL_P)
+    rest = h & ((1 << (64 - HLL_P)) - 1)
+    rank = (64 - HLL_P) - rest.bit_length() + 1
+    if rank > registers[index]:
+        registers[index] = rank
+
+
+def hll_count(registers):
+    """Estimated number of distinct users in a sketch."""
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.exp2(-registers.astype(float)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)  # linear counting for small sets
+    return int(round(estimate))
+
+
+def _empty_sketch():
+    return np.zeros(1 << HLL_P, dtype=np.uint8)
+
+
+def _buckets(ts):
+    day = datetime.fromtimestamp(ts, timezone.utc)
+    return f"d:{day:%Y-%m-%d}", f"m:{day:%Y-%m}"
+
+
+# ---------------- Store ----------------
+class EngagementStore:
+    """Event log plus day/month counters in one SQLite file, written in batches."""
+
+    def __init__(self, path=None, flush_interval=None):
+        self.path = path or os.environ.get("ENGAGEMENT_DB_PATH", "engagement.db")
+        self.flush_interval = flush_interval or float(os.environ.get("ENGAGEMENT_FLUSH_INTERVAL", "2"))
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS events (ts INTEGER NOT NULL, kind INTEGER NOT NULL, user INTEGER NOT NULL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters ("
+            " bucket TEXT NOT NULL,"
+            " kind INTEGER NOT NULL,"
+            " events INTEGER NOT NULL,"
+            " sketch BLOB NOT NULL,"
+            " PRIMARY KEY (bucket, kind)"
+            ") WITHOUT ROWID"
+        )
+        self._pending_events = []
+        self._pending = {}  # (bucket, kind) -> [count, sketch]
+        self._lock = threading.Lock()
+        threading.Thread(target=self._flusher, name="engagement-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def record(self, kind, email, ts=None):
+        """Count one event. Only touches memory; flush() makes it durable."""
+        ts = int(ts if ts is not None else time.time())
+        code, h = KINDS[kind], user_hash(email)
+        with self._lock:
+            self._pending_events.append((ts, code, h - (1 << 63)))  # signed for SQLite
+            for bucket in _buckets(ts):
+                entry = self._pending.get((bucket, code))
+                if entry is None:
+                    entry = self._pending[(bucket, code)] = [0, _empty_sketch()]
+                entry[0] += 1
+                hll_add(entry[1], h)
+
+    def flush(self):
+        """Append pending events to the log and merge pending deltas into the counters."""
+        with self._lock:
+            events, self._pending_events = self._pending_events, []
+            deltas, self._pending = self._pending, {}
+        if not events:
+            return
+        try:
+            self._merge(events, deltas)
+        except sqlite3.Error:
+            with self._lock:  # keep the batch for the next attempt, ahead of anything recorded since
+                self._pending_events[:0] = events
+                for key, (count, sketch) in deltas.items():
+                    entry = self._pending.get(key)
+                    if entry is None:
+                        self._pending[key] = [count, sketch]
+                    else:
+                        entry[0] += count
+                        np.maximum(entry[1], sketch, out=entry[1])
+            raise
+
+    def _merge(self, events, deltas):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT INTO events (ts, kind, user) VALUES (?, ?, ?)", events)
+            for (bucket, kind), (count, sketch) in deltas.items():
+                row = conn.execute(
+                    "SELECT events, sketch FROM counters WHERE bucket = ? AND kind = ?", (bucket, kind)
+                ).fetchone()
+                if row is not None:
+                    count += row[0]
+                    sketch = np.maximum(sketch, np.frombuffer(row[1], dtype=np.uint8))
+                conn.execute(
+                    "INSERT OR REPLACE INTO counters (bucket, kind, events, sketch) VALUES (?, ?, ?, ?)",
+                    (bucket, kind, count, sketch.tobytes()),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print("❌ Error flushing engagement counters:", e)
+
+    def rebuild(self):
+        """Recompute every counter from the event log (after a schema change or corruption)."""
+        self.flush()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            deltas = {}
+            for ts, code, user in conn.execute("SELECT ts, kind, user FROM events"):
+                h = user + (1 << 63)
+                for bucket in _buckets(ts):
+                    entry = deltas.setdefault((bucket, code), [0, _empty_sketch()])
+                    entry[0] += 1
+                    hll_add(entry[1], h)
+            conn.execute("DELETE FROM counters")
+            conn.executemany(
+                "INSERT INTO counters (bucket, kind, events, sketch) VALUES (?, ?, ?, ?)",
+                ((b, k, c, s.tobytes()) for (b, k), (c, s) in deltas.items()),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(deltas)
+
+    def counters(self, buckets):
+        """{(bucket, kind name): (events, sketch)} for the given bucket keys."""
+        names = {code: name for name, code in KINDS.items()}
+        marks = ",".join("?" * len(buckets))
+        rows = self._conn().execute(
+            f"SELECT bucket, kind, events, sketch FROM counters WHERE bucket IN ({marks})", list(buckets)
+        )
+        return {(b, names[k]): (c, np.frombuffer(s, dtype=np.uint8)) for b, k, c, s in rows}
+
+
+def summary(store, days=30, now=None):
+    """Everything the Insights page shows, from days + 2 month buckets.
+
+    Returns daily active users and signups for the last `days` days, this and
+    last month's active users, signups and feedback, and the returning-user
+    ratio: the share of this month's active users also active last month,
+    via |A ∩ B| = |A| + |B| - |A ∪ B| on the sketches.
+    """
+    now = datetime.fromtimestamp(now if now is not None else time.time(), timezone.utc)
+    day_keys = [f"d:{now - timedelta(days=i):%Y-%m-%d}" for i in range(days - 1, -1, -1)]
+    this_month = f"m:{now:%Y-%m}"
+    last_month = f"m:{now.replace(day=1) - timedelta(days=1):%Y-%m}"
+    rows = store.counters(day_keys + [this_month, last_month])
+
+    def events(bucket, kind):
+        return rows.get((bucket, kind), (0, None))[0]
+
+    def sketch(bucket, kind):
+        return rows.get((bucket, kind), (0, _empty_sketch()))[1]
+
+    active_now, active_before = sketch(this_month, "login"), sketch(last_month, "login")
+    mau, prev_mau = hll_count(active_now), hll_count(active_before)
+    overlap = mau + prev_mau - hll_count(np.maximum(active_now, active_before))
+    return {
+        "days": [k[2:] for k in day_keys],
+        "daily_active": [hll_count(sketch(k, "login")) for k in day_keys],
+        "daily_signups": [events(k, "signup") for k in day_keys],
+        "mau": mau,
+        "prev_mau": prev_mau,
+        "signups": events(this_month, "signup"),
+        "prev_signups": events(last_month, "signup"),
+        "feedback": events(this_month, "feedback"),
+        "returning_ratio": min(1.0, max(0, overlap) / mau) if mau else None,
+    }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_engagement_store() -> EngagementStore:
+    """Process-wide store shared by every Streamlit session, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EngagementStore()
+        return _store
+
+
+def record(kind, email):
+    get_engagement_store().record(kind, email)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Engagement counters maintenance.")
+    parser.add_argument("--rebuild", action="store_true", help="recompute all counters from the event log")
+    args = parser.parse_args()
+    store = EngagementStore()
+    if args.rebuild:
+        print(f"Rebuilt {store.rebuild()} counter rows")
+    print(summary(store))
@@ -0,0 +1,234 @@
+# feedback_store.py
+"""Durable, batched storage for Feedback page submissions.
+
+submit() only appends to an in-memory buffer, so the Submit button never
+waits on disk. A background writer drains the buffer whenever it holds
+FEEDBACK_BATCH records or FEEDBACK_FLUSH_INTERVAL seconds have passed,
+appending each batch to the active segment with one write() and one fsync().
+
+Segments are append-only JSONL files named after the timestamp of their
+first record and the process writing them (segment-<ts>-<host>-<pid>.jsonl),
+and are rolled at FEEDBACK_SEGMENT_BYTES. Every process writes only its own
+segments, starting a new one when it opens the store, so any number of app
+processes can share FEEDBACK_DIR. Each writer's records are in submission
+order, so query(start, end) only opens the segments whose span overlaps the
+range, stops reading a writer's segments at its first record past `end`, and
+merges the writers by timestamp.
+
+Crash recovery: a crash mid-write can leave a torn last line in a segment.
+Readers skip it, and a process that finds segments under its own writer id
+(a restart that got the same pid) truncates it before writing. Anything
+still in the buffer (at most one flush interval) is lost, which is the
+price of not fsyncing per click.
+
+    FEEDBACK_DIR              segment directory (default feedback)
+    FEEDBACK_BATCH            records per flush (default 100)
+    FEEDBACK_FLUSH_INTERVAL   max seconds a record waits in memory (default 1)
+    FEEDBACK_SEGMENT_BYTES    roll segments at this size (default 4 MiB)
+    FEEDBACK_MAX_BUFFER       buffered records before submit() refuses (default 10000)
+
+Read it back with: python feedback_store.py [--since 2026-01-01] [--until 2026-02-01]
+"""
+import argparse
+import atexit
+import heapq
+import json
+import os
+import re
+import socket
+import threading
+import time
+from datetime import datetime
+
+FEEDBACK_DIR = os.environ.get("FEEDBACK_DIR", "feedback")
+
+
+def _writer_id():
+    return f"{re.sub(r'[^A-Za-z0-9.-]', '_', socket.gethostname())}-{os.getpid()}"
+
+
+def _parse_segment(filename):
+    """(start ts, writer id) from a segment filename; segments from before writer ids have writer ''."""
+    start, _, writer = filename[len("segment-"):-len(".jsonl")].partition("-")
+    return float(start), writer
+
+
+def _segment_start(filename):
+    return _parse_segment(filename)[0]
+
+
+class FeedbackStore:
+    """Append-only JSONL segments of {"ts", "email", "text"} records."""
+
+    def __init__(self, directory=FEEDBACK_DIR, segment_bytes=None):
+        self.directory = directory
+        self.segment_bytes = segment_bytes or int(os.environ.get("FEEDBACK_SEGMENT_BYTES", str(4 << 20)))
+        os.makedirs(directory, exist_ok=True)
+        self.writer = _writer_id()
+        self._file = None  # the first append starts a new segment
+        own = [n for n in self.segments() if _parse_segment(n)[1] == self.writer]
+        if own:
+            self._recover(own[-1])  # left by a dead process with our pid; no one else writes it
+
+    def segments(self):
+        """Segment filenames, oldest first."""
+        names = [n for n in os.listdir(self.directory) if n.startswith("segment-") and n.endswith(".jsonl")]
+        return sorted(names, key=_segment_start)
+
+    def _recover(self, name):
+        """Cut a torn trailing record off one of this writer's segments."""
+        path = os.path.join(self.directory, name)
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+                print(f"⚠️ Dropped {len(data) - end} bytes of a torn record from {name}")
+
+    def _roll(self, ts):
+        name = f"segment-{ts:.6f}-{self.writer}.jsonl"
+        new_file = open(os.path.join(self.directory, name), "ab")  # if this fails, keep the current segment
+        if self._file is not None:
+            self._file.close()
+        self._file = new_file
+        # Make the new directory entry itself durable
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def append(self, records):
+        """Write a batch durably: one write and one fsync per batch."""
+        if not records:
+            return
+        if self._file is None or self._file.tell() >= self.segment_bytes:
+            self._roll(records[0]["ts"])
+        data = b"".join(json.dumps(r, ensure_ascii=False).encode() + b"\n" for r in records)
+        start = self._file.tell()
+        try:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError:
+            # Cut off whatever part of the batch made it, so the retry does not leave a torn record mid-file
+            try:
+                self._file.truncate(start)
+                self._file.seek(start)
+            except (OSError, ValueError):
+                self._file = None  # unusable: the retry starts a new segment
+            raise
+
+    def query(self, start=None, end=None):
+        """Yield records with start <= ts < end (either bound optional), oldest first."""
+        by_writer = {}
+        for name in self.segments():
+            by_writer.setdefault(_parse_segment(name)[1], []).append(name)
+        streams = [self._query_writer(segments, start, end) for segments in by_writer.values()]
+        return heapq.merge(*streams, key=lambda record: record["ts"])
+
+    def _query_writer(self, segments, start, end):
+        """Records in range from one writer's segments (oldest first), which are in ts order."""
+        for i, name in enumerate(segments):
+            next_start = _segment_start(segments[i + 1]) if i + 1 < len(segments) else None
+            if start is not None and next_start is not None and next_start <= start:
+                continue  # the whole segment is older than the range
+            if end is not None and _segment_start(name) >= end:
+                return
+            with open(os.path.join(self.directory, name), "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # being written right now
+                    record = json.loads(line)
+                    if end is not None and record["ts"] >= end:
+                        return
+                    if start is None or record["ts"] >= start:
+                        yield record
+
+
+class FeedbackSink:
+    """In-memory buffer in front of a FeedbackStore, drained by one writer thread."""
+
+    def __init__(self, store=None, batch=None, flush_interval=None, max_buffer=None):
+        self.store = store or FeedbackStore()
+        self.batch = batch or int(os.environ.get("FEEDBACK_BATCH", "100"))
+        self.flush_interval = flush_interval or float(os.environ.get("FEEDBACK_FLUSH_INTERVAL", "1"))
+        self.max_buffer = max_buffer or int(os.environ.get("FEEDBACK_MAX_BUFFER", "10000"))
+        self._buffer = []
+        self._written = 0   # records handed to the store so far
+        self._submitted = 0
+        self._flush_requested = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._writer, name="feedback-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, email, text) -> bool:
+        """Buffer one submission. False if the writer has fallen too far behind or stopped."""
+        with self._cond:
+            if len(self._buffer) >= self.max_buffer or not self._thread.is_alive():
+                return False
+            self._buffer.append({"ts": time.time(), "email": email, "text": text})
+            self._submitted += 1
+            if len(self._buffer) >= self.batch:
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout=5.0) -> bool:
+        """Block until everything submitted so far is on disk. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            target = self._submitted
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._written < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._buffer) >= self.batch or self._flush_requested, timeout=self.flush_interval
+                )
+                batch, self._buffer = self._buffer, []
+                self._flush_requested = False
+            try:
+                self.store.append(batch)
+            except Exception as e:  # never let one bad batch stop the writer for good
+                print("❌ Error writing feedback:", e)
+                with self._cond:
+                    self._buffer[:0] = batch  # keep it for the next attempt
+                time.sleep(self.flush_interval)
+                continue
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_feedback_sink() -> FeedbackSink:
+    """Process-wide sink shared by every Streamlit session, started on first use."""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = FeedbackSink()
+        return _sink
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print stored feedback as JSON lines.")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO date/time, inclusive")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="ISO date/time, exclusive")
+    args = parser.parse_args()
+    store = FeedbackStore()
+    for record in store.query(args.since and args.since.timestamp(), args.until and args.until.timestamp()):
+        print(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,47 @@
+# geo_cache.py
+"""Pre-simplified world geometries for the choropleth.
+
+build_geometry.py writes one quantized TopoJSON file per simplification level
+to static/geo/, named by content hash. The map never embeds geometry in the
+chart spec: it points Vega at the static URL, so the browser downloads each
+level once and keeps it, and only the per-country values change between
+renders. The level is picked so one simplification step is about one pixel
+at the map's width.
+"""
+import json
+import os
+
+# level -> (Douglas-Peucker tolerance in degrees, quantization, widest map in px it is meant for)
+LEVELS = {
+    "low": (0.5, 10_000, 480),
+    "medium": (0.1, 50_000, 1200),
+    "high": (0.02, 100_000, None),
+}
+
+GEO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "geo")
+MANIFEST_PATH = os.path.join(GEO_DIR, "manifest.json")
+STATIC_URL = "/app/static/geo/"
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_manifest = _load_manifest()
+
+
+def level_for_width(width_px: int) -> str:
+    for level, (_, _, max_width) in LEVELS.items():
+        if max_width is None or width_px <= max_width:
+            return level
+    return "high"
+
+
+def topojson_url(width_px: int):
+    """Static URL of the geometry level for a map `width_px` wide, or None if not built."""
+    filename = _manifest.get(level_for_width(width_px))
+    return STATIC_URL + filename if filename else None
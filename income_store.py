@@ -0,0 +1,84 @@
+# income_store.py
+"""Memory-mapped, columnar store for the income/inequality dataset.
+
+ingest.py writes data/income.arrow: an uncompressed Arrow IPC file with one
+row per country-year, sorted by (country_code, year), with one float column
+per income group (decile1..decile10 shares, say). The row range of every
+country and a dataset version hash are kept in the schema metadata.
+
+Readers memory-map the file, so the columns are never parsed or copied into
+private memory: every Streamlit process shares the same pages from the OS
+page cache, and opening the store only touches the footer and metadata.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+
+DATA_DIR = os.environ.get("INCOME_DATA_DIR", "data")
+DATASET_FILE = "income.arrow"
+
+
+class IncomeStore:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, DATASET_FILE)
+        self.mtime = os.path.getmtime(self.path)
+        self._source = pa.memory_map(self.path, "r")
+        self.table = pa.ipc.open_file(self._source).read_all()  # zero-copy views into the map
+        meta = {k.decode(): v.decode() for k, v in (self.table.schema.metadata or {}).items()}
+        self.version = meta["version"]
+        self.group_columns = json.loads(meta["group_columns"])
+        self.country_index = {code: tuple(span) for code, span in json.loads(meta["country_index"]).items()}
+        self._years = self.table.column("year").to_numpy()
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def countries(self):
+        return list(self.country_index)
+
+    def rows(self, country=None, year_from=None, year_to=None):
+        """Arrow slice (no copy) for one country and/or an inclusive year range."""
+        if country is None:
+            if year_from is None and year_to is None:
+                return self.table
+            years = self._years
+            mask = np.ones(len(years), dtype=bool)
+            if year_from is not None:
+                mask &= years >= year_from
+            if year_to is not None:
+                mask &= years <= year_to
+            return self.table.filter(pa.array(mask))
+        if country not in self.country_index:
+            return self.table.slice(0, 0)
+        start, stop = self.country_index[country]
+        years = self._years[start:stop]  # sorted within a country
+        lo = start + (np.searchsorted(years, year_from, "left") if year_from is not None else 0)
+        hi = start + (np.searchsorted(years, year_to, "right") if year_to is not None else len(years))
+        return self.table.slice(lo, hi - lo)
+
+    def group_matrix(self, table):
+        """(rows, groups) float matrix of the income-group columns, for inequality_metrics."""
+        if table.num_rows == 0:
+            return np.empty((0, len(self.group_columns)))
+        return np.column_stack([
+            table.column(name).to_numpy(zero_copy_only=False) for name in self.group_columns
+        ])
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_income_store():
+    """Process-wide store, reopened when ingest.py replaces the file. None if not ingested."""
+    global _store
+    path = os.path.join(DATA_DIR, DATASET_FILE)
+    with _store_lock:
+        if not os.path.exists(path):
+            _store = None
+        elif _store is None or _store.mtime != os.path.getmtime(path):
+            _store = IncomeStore(path)
+        return _store
@@ -0,0 +1,130 @@
+# ingest.py
+"""Convert raw income/inequality CSV exports into the columnar dataset store.
+
+    python ingest.py pip_export.csv [more.csv ...] [--groups decile] [--column reporting_year=year]
+
+Each CSV needs one row per country-year with a ``country_code`` and ``year``
+column and one column per income group, named <prefix><n> (decile1 ..
+decile10 by default) and holding that group's income share or mean income.
+``country_name``, ``region``, ``income_group`` and ``population`` are kept
+when present. ``--column`` renames source columns to those names.
+
+The output (data/income.arrow, see income_store.py) is sorted by country and
+year, uncompressed so it can be memory-mapped, and replaced atomically so
+running app processes pick the new version up on their next rerun. The
+region / income group / period aggregate cube (aggregate_cube.py) is
+rebuilt next to it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv
+
+from aggregate_cube import CUBE_FILE, build_cube, write_cube
+from income_store import DATA_DIR, DATASET_FILE
+
+OPTIONAL_COLUMNS = {
+    "country_name": pa.string(),
+    "region": pa.string(),
+    "income_group": pa.string(),
+    "population": pa.float64(),
+}
+
+
+def read_export(path, renames, prefix):
+    table = csv.read_csv(path)
+    table = table.rename_columns([renames.get(name, name) for name in table.column_names])
+    for required in ("country_code", "year"):
+        if required not in table.column_names:
+            raise SystemExit(f"{path}: missing required column {required!r}")
+
+    pattern = re.compile(re.escape(prefix) + r"(\d+)$")
+    groups = sorted((int(m.group(1)), name) for name in table.column_names if (m := pattern.match(name)))
+    if not groups:
+        raise SystemExit(f"{path}: no income group columns named {prefix}<n>")
+
+    columns = {
+        "country_code": table.column("country_code").cast(pa.string()),
+        "year": table.column("year").cast(pa.int32()),
+    }
+    for name, type_ in OPTIONAL_COLUMNS.items():
+        if name in table.column_names:
+            columns[name] = table.column(name).cast(type_)
+        else:
+            columns[name] = pa.nulls(table.num_rows, type_)
+    for _, name in groups:
+        columns[name] = table.column(name).cast(pa.float64())
+    return pa.table(columns), [name for _, name in groups]
+
+
+def build_dataset(paths, renames=None, prefix="decile"):
+    """Read, merge and sort the exports. Returns (table, group_columns, country_index)."""
+    tables, group_columns = [], None
+    for path in paths:
+        table, groups = read_export(path, renames or {}, prefix)
+        if group_columns is not None and groups != group_columns:
+            raise SystemExit(f"{path}: income groups {groups} do not match {group_columns}")
+        tables.append(table)
+        group_columns = groups
+    table = pa.concat_tables(tables).sort_by([("country_code", "ascending"), ("year", "ascending")])
+    table = table.combine_chunks()
+
+    codes = table.column("country_code").to_numpy(zero_copy_only=False)
+    country_index = {}
+    if len(codes):
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        stops = np.r_[starts[1:], len(codes)]
+        country_index = {str(codes[a]): [int(a), int(b)] for a, b in zip(starts, stops)}
+    return table, group_columns, country_index
+
+
+def write_dataset(table, group_columns, country_index, out_path):
+    """Write an uncompressed Arrow IPC file with the index and a content version in its metadata."""
+    digest = hashlib.sha256()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    digest.update(sink.getvalue())
+    metadata = {
+        "version": digest.hexdigest()[:16],
+        "group_columns": json.dumps(group_columns),
+        "country_index": json.dumps(country_index),
+    }
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as f, pa.ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table, max_chunksize=1 << 20)
+    os.replace(tmp, out_path)
+    return metadata["version"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", nargs="+")
+    parser.add_argument("--groups", default="decile", help="prefix of the income group columns")
+    parser.add_argument("--column", action="append", default=[], metavar="SRC=DST",
+                        help="rename a source column, e.g. reporting_year=year")
+    parser.add_argument("--out", default=os.path.join(DATA_DIR, DATASET_FILE))
+    args = parser.parse_args()
+
+    renames = dict(item.split("=", 1) for item in args.column)
+    table, group_columns, country_index = build_dataset(args.csv, renames, args.groups)
+    version = write_dataset(table, group_columns, country_index, args.out)
+    cube = build_cube(table, group_columns, version)
+    write_cube(cube, os.path.join(os.path.dirname(args.out) or ".", CUBE_FILE))
+    years = pc.min_max(table.column("year")).as_py() if table.num_rows else {"min": None, "max": None}
+    print(f"Wrote {table.num_rows} rows, {len(country_index)} countries, "
+          f"years {years['min']}-{years['max']} to {args.out} (version {version}), "
+          f"{cube.num_rows} aggregate cells")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# lottie_cache.py
+"""Process-wide cache for Lottie animation JSON.
+
+Every Streamlit session in the process shares one in-memory LRU, backed by a
+disk tier under .cache/lottie so a restarted worker does not have to go back
+to the network either. Entries older than LOTTIE_TTL seconds are revalidated
+with a conditional GET (ETag / Last-Modified); a 304 just renews them. If the
+network is down a stale copy is served rather than nothing.
+
+    LOTTIE_TTL          seconds before revalidation (default 86400)
+    LOTTIE_CACHE_DIR    disk tier location (default .cache/lottie)
+    LOTTIE_MEMORY_ITEMS LRU size (default 32)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+TIMEOUT = (3.05, 10)  # (connect, read) seconds
+
+TTL = float(os.environ.get("LOTTIE_TTL", "86400"))
+CACHE_DIR = os.environ.get("LOTTIE_CACHE_DIR", os.path.join(".cache", "lottie"))
+MEMORY_ITEMS = int(os.environ.get("LOTTIE_MEMORY_ITEMS", "32"))
+
+_memory = OrderedDict()  # url -> entry dict, most recently used last
+_lock = threading.Lock()
+_warmed = set()
+
+
+class LottieFetchError(Exception):
+    """Raised when an animation is neither cached nor fetchable."""
+
+
+def _disk_path(url):
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+
+def _read_disk(url):
+    try:
+        with open(_disk_path(url)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("url") == url else None
+
+
+def _write_disk(entry):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _disk_path(entry["url"])
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)  # atomic, so concurrent workers never read half a file
+
+
+def _remember(entry):
+    with _lock:
+        _memory[entry["url"]] = entry
+        _memory.move_to_end(entry["url"])
+        while len(_memory) > MEMORY_ITEMS:
+            _memory.popitem(last=False)
+
+
+def _fetch(url, stale=None):
+    """GET the animation, conditionally if we have a stale copy. Returns a fresh entry."""
+    import requests  # only on a cache miss: it is a good part of cold start otherwise
+
+    headers = {}
+    if stale is not None:
+        if stale.get("etag"):
+            headers["If-None-Match"] = stale["etag"]
+        if stale.get("last_modified"):
+            headers["If-Modified-Since"] = stale["last_modified"]
+    r = requests.get(url, headers=headers, timeout=TIMEOUT)
+    if r.status_code == 304 and stale is not None:
+        entry = dict(stale, fetched_at=time.time())
+    elif r.status_code == 200:
+        entry = {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "data": r.json(),
+        }
+    else:
+        raise LottieFetchError(f"Lottie URL failed ({r.status_code}): {url}")
+    _write_disk(entry)
+    return entry
+
+
+def get_lottie(url: str) -> dict:
+    """Return the animation JSON for url, from memory, disk or network in that order."""
+    with _lock:
+        entry = _memory.get(url)
+        if entry is not None:
+            _memory.move_to_end(url)
+    if entry is None:
+        entry = _read_disk(url)
+    if entry is not None and time.time() - entry["fetched_at"] < TTL:
+        _remember(entry)
+        return entry["data"]
+
+    import requests
+
+    try:
+        entry = _fetch(url, stale=entry)
+    except (requests.RequestException, ValueError, LottieFetchError) as e:
+        if entry is None:
+            raise LottieFetchError(str(e)) from e
+        # Serve the stale copy rather than nothing; retry after another TTL
+        entry = dict(entry, fetched_at=time.time())
+    _remember(entry)
+    return entry["data"]
+
+
+def warm_up(urls):
+    """Fetch urls into the cache on a background thread, once per process."""
+    with _lock:
+        todo = [url for url in urls if url not in _warmed]
+        _warmed.update(todo)
+    if not todo:
+        return
+
+    def run():
+        for url in todo:
+            try:
+                get_lottie(url)
+            except LottieFetchError as e:
+                print("❌ Lottie warm-up failed:", e)
+
+    threading.Thread(target=run, name="lottie-warm-up", daemon=True).start()
@@ -0,0 +1,162 @@
+# otp_delivery.py
+"""Background e-mail delivery for OTPs.
+
+send_otp() used to open a fresh SMTP connection, run STARTTLS and login on
+the Streamlit script thread for every request. Messages now go onto a bounded
+queue drained by a few worker threads, each keeping one SMTP connection open
+and reusing it across messages. Callers get a DeliveryHandle back straight
+away and can poll it from the UI.
+
+Everything is configured through the environment so the queue can be pointed
+at a local stand-in (e.g. ``python -m aiosmtpd -n -l localhost:8025``
+with SMTP_HOST=localhost SMTP_PORT=8025 SMTP_STARTTLS=0 SMTP_PASSWORD=):
+
+    SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD, SMTP_STARTTLS
+    OTP_QUEUE_SIZE, OTP_WORKERS, OTP_MAX_ATTEMPTS, SMTP_IDLE_TIMEOUT
+"""
+import os
+import queue
+import smtplib
+import threading
+import time
+
+QUEUED, SENDING, SENT, FAILED, REJECTED = "queued", "sending", "sent", "failed", "rejected"
+
+
+class DeliveryHandle:
+    """Status of one queued message, safe to poll from any thread."""
+
+    def __init__(self, to_addr):
+        self.to_addr = to_addr
+        self.status = QUEUED
+        self.attempts = 0
+        self.error = None
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        """Block until the message is sent or has failed. Returns done()."""
+        return self._done.wait(timeout)
+
+    def _finish(self, status, error=None):
+        self.status = status
+        self.error = error
+        self._done.set()
+
+
+def rejected_handle(to_addr, reason) -> DeliveryHandle:
+    """A handle for a message that was refused before reaching the queue."""
+    handle = DeliveryHandle(to_addr)
+    handle._finish(REJECTED, reason)
+    return handle
+
+
+class SMTPConfig:
+    def __init__(self):
+        self.host = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+        self.port = int(os.environ.get("SMTP_PORT", "587"))
+        self.user = os.environ.get("SMTP_USER", "asheemohammad123@gmail.com")   # <-- replace with your Gmail
+        self.password = os.environ.get("SMTP_PASSWORD", "jxeaeuilwswpfyro")     # <-- replace with Gmail App Password
+        self.starttls = os.environ.get("SMTP_STARTTLS", "1") == "1"
+        self.idle_timeout = float(os.environ.get("SMTP_IDLE_TIMEOUT", "60"))
+
+
+class DeliveryQueue:
+    """Bounded queue of outgoing messages with pooled SMTP connections."""
+
+    def __init__(self, config=None, maxsize=None, workers=None, max_attempts=None, backoff=0.5):
+        self.config = config or SMTPConfig()
+        self.max_attempts = max_attempts or int(os.environ.get("OTP_MAX_ATTEMPTS", "3"))
+        self.backoff = backoff
+        self._queue = queue.Queue(maxsize or int(os.environ.get("OTP_QUEUE_SIZE", "100")))
+        self._threads = []
+        for i in range(workers or int(os.environ.get("OTP_WORKERS", "2"))):
+            t = threading.Thread(target=self._worker, name=f"otp-delivery-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, to_addr, msg) -> DeliveryHandle:
+        """Queue a MIME message without blocking. A full queue yields a REJECTED handle."""
+        handle = DeliveryHandle(to_addr)
+        try:
+            self._queue.put_nowait((msg, handle))
+        except queue.Full:
+            return rejected_handle(to_addr, "delivery queue is full")
+        return handle
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # ---------------- Worker ----------------
+    def _connect(self):
+        server = smtplib.SMTP(self.config.host, self.config.port, timeout=10)
+        if self.config.starttls:
+            server.starttls()
+        if self.config.password:
+            server.login(self.config.user, self.config.password)
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _worker(self):
+        server = None
+        last_used = 0.0
+        while True:
+            try:
+                msg, handle = self._queue.get(timeout=self.config.idle_timeout)
+            except queue.Empty:
+                # Drop idle connections before the server does it for us
+                if server is not None:
+                    self._close(server)
+                    server = None
+                continue
+
+            handle.status = SENDING
+            while True:
+                handle.attempts += 1
+                try:
+                    if server is not None and time.monotonic() - last_used > self.config.idle_timeout:
+                        self._close(server)
+                        server = None
+                    if server is None:
+                        server = self._connect()
+                    server.sendmail(self.config.user, [handle.to_addr], msg.as_string())
+                    last_used = time.monotonic()
+                    handle._finish(SENT)
+                    print("✅ OTP email sent to", handle.to_addr)
+                    break
+                except smtplib.SMTPRecipientsRefused as e:
+                    # The connection is fine, the address is not: no point retrying
+                    handle._finish(FAILED, str(e))
+                    print("❌ Error sending email:", e)
+                    break
+                except Exception as e:
+                    if server is not None:
+                        self._close(server)
+                        server = None
+                    if handle.attempts >= self.max_attempts:
+                        handle._finish(FAILED, str(e))
+                        print("❌ Error sending email:", e)
+                        break
+                    time.sleep(self.backoff * 2 ** (handle.attempts - 1))
+            self._queue.task_done()
+
+
+_delivery_queue = None
+_delivery_lock = threading.Lock()
+
+
+def get_delivery_queue() -> DeliveryQueue:
+    """Process-wide queue shared by every Streamlit session, started on first use."""
+    global _delivery_queue
+    with _delivery_lock:
+        if _delivery_queue is None:
+            _delivery_queue = DeliveryQueue()
+        return _delivery_queue
@@ -0,0 +1,142 @@
+# passwords.py
+"""Salted scrypt password hashing on a bounded worker pool.
+
+scrypt is deliberately slow and memory-hard, so hashing and verification run
+on a small shared thread pool (hashlib.scrypt releases the GIL) rather than
+at unbounded concurrency on whichever Streamlit thread asked. At most
+PASSWORD_MAX_PENDING jobs may be queued or running; beyond that callers get
+PasswordPoolBusy straight away instead of piling up.
+
+Stored format: scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>. Anything else is a
+legacy plaintext record, which verify() still accepts and needs_rehash()
+flags so auth_module can upgrade it after the next successful login.
+
+    PASSWORD_SCRYPT_N / _R / _P   cost parameters (default 2**14, 8, 1)
+    PASSWORD_MAX_COST             largest 128*n*r*p (bytes) a stored hash may ask for
+                                  (default 64 MiB, or the configured cost if higher)
+    PASSWORD_WORKERS              pool threads (default min(4, CPUs))
+    PASSWORD_MAX_PENDING          queued + running jobs allowed (default 64)
+    PASSWORD_WAIT_TIMEOUT         seconds to wait for a pool slot (default 0.5)
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEME = "scrypt"
+
+N = int(os.environ.get("PASSWORD_SCRYPT_N", str(2 ** 14)))
+R = int(os.environ.get("PASSWORD_SCRYPT_R", "8"))
+P = int(os.environ.get("PASSWORD_SCRYPT_P", "1"))
+# 128*n*r is the bytes scrypt allocates and n*r*p sets its running time, so this bounds both
+MAX_COST = max(int(os.environ.get("PASSWORD_MAX_COST", str(64 << 20))), 128 * N * R * P)
+WORKERS = int(os.environ.get("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+MAX_PENDING = int(os.environ.get("PASSWORD_MAX_PENDING", "64"))
+WAIT_TIMEOUT = float(os.environ.get("PASSWORD_WAIT_TIMEOUT", "0.5"))
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the hashing pool is saturated."""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode()
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=32)
+
+
+def _hash(password, n=N, r=R, p=P):
+    salt = secrets.token_bytes(16)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+
+def parse_hash(stored):
+    """(n, r, p, salt, digest) of a well-formed scrypt record, else None.
+
+    Records costing more than MAX_COST are rejected too, so one planted record
+    cannot make every login on its email tie up a pool worker and gigabytes of memory.
+    """
+    parts = stored.split("$")
+    if len(parts) != 6 or parts[0] != SCHEME:
+        return None
+    try:
+        n, r, p = (int(x) for x in parts[1:4])
+        salt = base64.b64decode(parts[4], validate=True)
+        digest = base64.b64decode(parts[5], validate=True)
+    except ValueError:  # binascii.Error is a ValueError too
+        return None
+    if not (n > 1 and n & (n - 1) == 0 and r > 0 and p > 0 and 128 * n * r * p <= MAX_COST):
+        return None
+    if not salt or len(digest) != 32:
+        return None
+    return n, r, p, salt, digest
+
+
+def _verify(password, stored):
+    if not stored.startswith(SCHEME + "$"):
+        # Legacy plaintext record
+        return hmac.compare_digest(password.encode(), stored.encode())
+    parsed = parse_hash(stored)
+    if parsed is None:  # corrupt record: a failed login, not a crash
+        return False
+    n, r, p, salt, expected = parsed
+    return hmac.compare_digest(_scrypt(password, salt, n, r, p), expected)
+
+
+def needs_rehash(stored):
+    """True for plaintext records and hashes made with other cost parameters."""
+    return not stored.startswith(f"{SCHEME}${N}${R}${P}$")
+
+
+# ---------------- Bounded pool ----------------
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="password-hash")
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+
+
+def _run(fn, *args):
+    if not _slots.acquire(timeout=WAIT_TIMEOUT):
+        raise PasswordPoolBusy("Too many logins in progress, please try again.")
+    try:
+        future = _pool.submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result()
+
+
+def hash_password(password: str) -> str:
+    """Salted scrypt hash of password, computed on the pool."""
+    return _run(_hash, password)
+
+
+def hash_password_direct(password: str) -> str:
+    """Salted scrypt hash computed on the calling thread, bypassing the pool.
+
+    For batch jobs such as user_import.py, which hash on their own worker processes.
+    """
+    return _hash(password)
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check password against a stored hash (or legacy plaintext), on the pool."""
+    return _run(_verify, password, stored)
+
+
+_dummy_hash = None
+
+
+def dummy_hash() -> str:
+    """Verified against when the email is unknown, so a miss costs the same as a hit.
+
+    Made on first use rather than at import: one scrypt run is ~50 ms of cold start.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = _hash(secrets.token_urlsafe(16))
+    return _dummy_hash
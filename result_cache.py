@@ -0,0 +1,129 @@
+# result_cache.py
+"""Cross-session cache for computed dashboard results.
+
+Every Streamlit session in a process shares one LRU keyed by
+(query name, arguments, dataset version). It is bounded by an estimate of
+the bytes held rather than by entry count, so one huge table cannot push out
+hundreds of small ones unnoticed. When the dataset version changes, all
+entries computed from older versions are dropped at once.
+
+    RESULT_CACHE_BYTES   memory budget (default 64 MiB)
+
+stats() returns hit / miss / eviction counters and current usage for sizing
+the budget in production.
+"""
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pyarrow as pa
+
+from income_store import get_income_store
+
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+
+def estimate_bytes(value):
+    """Rough in-memory size of a cached result."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pa.Table, pa.Array, pa.ChunkedArray, pa.RecordBatch)):
+        return value.nbytes
+    if hasattr(value, "memory_usage"):  # pandas objects
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_BUDGET):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size), most recently used last
+        self._lock = threading.Lock()
+        self._version = None
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def _drop(self, key):
+        _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def _check_version(self, version):
+        if version != self._version:
+            stale = [key for key in self._entries if key[-1] != version]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+            self._version = version
+
+    def get_or_compute(self, key, version, compute):
+        key = (*key, version)
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()  # outside the lock: other sessions keep being served
+        size = estimate_bytes(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._entries or version != self._version:
+                return value
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache = ResultCache(int(os.environ.get("RESULT_CACHE_BYTES", DEFAULT_BUDGET)))
+
+
+def cached_result(name):
+    """Decorator: cache a dataset query by (name, arguments, dataset version).
+
+    The wrapped function's arguments are its filters and must be hashable.
+    Results are shared between sessions, so callers must not mutate them.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            store = get_income_store()
+            version = store.version if store is not None else None
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return _cache.get_or_compute(key, version, lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def stats():
+    return _cache.stats()
@@ -0,0 +1,159 @@
+# session_store.py
+"""Shared key/value store for OTPs and login sessions.
+
+st.session_state lives in one process, so a password reset only worked if
+every request landed on the replica that sent the OTP. OTPs and login
+sessions now go to a store all replicas share, behind a small interface
+(set / get / delete / consume / sweep) with per-key expiry:
+
+    SESSION_STORE_BACKEND=sqlite  (default) one SQLite file in WAL mode,
+                                  for replicas on one host or a shared volume
+    SESSION_STORE_BACKEND=redis   any Redis-protocol server (needs `pip install redis`);
+                                  point it at a local stand-in with e.g. SESSION_REDIS_URL=redis://localhost:6380/0
+
+    SESSION_DB_PATH        SQLite file (default sessions.db)
+    SESSION_REDIS_URL      Redis URL (default redis://localhost:6379/0)
+    SESSION_SWEEP_INTERVAL seconds between expiry sweeps (SQLite only, default 60)
+    SESSION_SWEEP_BATCH    rows deleted per sweep transaction (default 500)
+
+consume(key, expected) deletes the key only if it still holds `expected`,
+atomically, so an OTP can be redeemed once however many replicas race for it.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+OTP_TTL = int(os.environ.get("OTP_TTL", "600"))
+SESSION_TTL = int(os.environ.get("SESSION_TTL", str(7 * 24 * 3600)))
+
+
+# ---------------- SQLite ----------------
+class SQLiteSessionStore:
+    """Keys in a SQLite file; expired rows are hidden on read and swept in batches."""
+
+    def __init__(self, path="sessions.db", sweep_interval=None, sweep_batch=None):
+        self.path = path
+        self.sweep_batch = sweep_batch or int(os.environ.get("SESSION_SWEEP_BATCH", "500"))
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL"
+            ")"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS kv_expires_at ON kv (expires_at)")
+
+        interval = sweep_interval or float(os.environ.get("SESSION_SWEEP_INTERVAL", "60"))
+        t = threading.Thread(target=self._sweeper, args=(interval,), name="session-sweep", daemon=True)
+        t.start()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def set(self, key, value, ttl):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM kv WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def consume(self, key, expected):
+        cur = self._conn().execute(
+            "DELETE FROM kv WHERE key = ? AND value = ? AND expires_at > ?", (key, expected, time.time())
+        )
+        return cur.rowcount == 1
+
+    def sweep(self):
+        """Delete expired rows, sweep_batch per transaction so writers never wait long. Returns the count."""
+        conn = self._conn()
+        removed = 0
+        while True:
+            cur = conn.execute(
+                "DELETE FROM kv WHERE rowid IN (SELECT rowid FROM kv WHERE expires_at <= ? LIMIT ?)",
+                (time.time(), self.sweep_batch),
+            )
+            removed += cur.rowcount
+            if cur.rowcount < self.sweep_batch:
+                return removed
+
+    def _sweeper(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.sweep()
+            except sqlite3.Error as e:
+                print("❌ Session sweep failed:", e)
+
+
+# ---------------- Redis ----------------
+class RedisSessionStore:
+    """Keys in Redis with native expiry (SET PX), so sweep() has nothing to do."""
+
+    def __init__(self, url="redis://localhost:6379/0"):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, px=int(ttl * 1000))
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def delete(self, key):
+        self.client.delete(key)
+
+    def consume(self, key, expected):
+        # WATCH/MULTI rather than a Lua script, so stand-ins without scripting work too
+        def compare_and_delete(pipe):
+            if pipe.get(key) != expected:
+                return False
+            pipe.multi()
+            pipe.delete(key)
+            return True
+
+        return self.client.transaction(compare_and_delete, key, value_from_callable=True)
+
+    def sweep(self):
+        return 0
+
+
+def open_session_store(backend=None):
+    """Open the configured session store (see module docstring)."""
+    backend = backend or os.environ.get("SESSION_STORE_BACKEND", "sqlite")
+    if backend == "sqlite":
+        return SQLiteSessionStore(os.environ.get("SESSION_DB_PATH", "sessions.db"))
+    if backend == "redis":
+        return RedisSessionStore(os.environ.get("SESSION_REDIS_URL", "redis://localhost:6379/0"))
+    raise ValueError(f"Unknown SESSION_STORE_BACKEND: {backend!r}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Process-wide store shared by every Streamlit session, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = open_session_store()
+        return _store
@@ -0,0 +1,85 @@
+# stylesheets.py
+"""Compile-once stylesheets.
+
+The CSS sources live in css/. At import time each stylesheet (the auth screens,
+and the dashboard in every theme) is concatenated, minified and written to
+static/css/<name>.<hash>.css, once per process. A rerun then only emits a
+~100 byte <link> tag; the browser fetches each hashed file once and keeps
+it, and the href only changes when st.session_state.theme does.
+
+Link mode needs Streamlit's static file server to send .css as text/css,
+which the Starlette-based server (1.66, the version requirements.txt asks
+for) does. Earlier, Tornado-based releases serve it as text/plain with
+nosniff, so browsers drop the stylesheet. Set STYLESHEET_MODE=inline to
+embed the minified CSS in a <style> block instead, on those releases or on
+deployments without static file serving.
+"""
+import hashlib
+import os
+import re
+
+import streamlit as st
+from telemetry import timed
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(APP_DIR, "css")
+OUTPUT_DIR = os.path.join(APP_DIR, "static", "css")
+STATIC_URL = "/app/static/css/"
+MODE = os.environ.get("STYLESHEET_MODE", "link")
+
+# stylesheet name -> css/ sources, in cascade order
+STYLESHEETS = {
+    "auth": ["auth.css"],
+    "dashboard": ["dashboard.css"],
+    "dashboard-dark": ["theme-dark.css", "dashboard.css"],
+    "dashboard-white": ["theme-white.css", "dashboard.css"],
+}
+THEME_STYLESHEETS = {
+    "System (Default)": "dashboard",
+    "Dark": "dashboard-dark",
+    "White": "dashboard-white",
+}
+
+
+def minify(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _compile(name, sources):
+    parts = []
+    for source in sources:
+        with open(os.path.join(SOURCE_DIR, source), encoding="utf-8") as f:
+            parts.append(f.read())
+    css = minify("\n".join(parts))
+    filename = f"{name}.{hashlib.sha256(css.encode()).hexdigest()[:12]}.css"
+    path = os.path.join(OUTPUT_DIR, filename)
+    if not os.path.exists(path):
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(css)
+        os.replace(tmp, path)
+    return filename, css
+
+
+_compiled = {name: _compile(name, sources) for name, sources in STYLESHEETS.items()}
+
+
+def stylesheet_tag(name: str) -> str:
+    filename, css = _compiled[name]
+    if MODE == "inline":
+        return f"<style>{css}</style>"
+    return f'<link rel="stylesheet" href="{STATIC_URL}{filename}">'
+
+
+@timed("css.inject")
+def inject_stylesheet(name: str):
+    """Emit the (tiny) tag for a compiled stylesheet on this rerun."""
+    st.markdown(stylesheet_tag(name), unsafe_allow_html=True)
+
+
+def inject_theme_stylesheet(theme: str):
+    inject_stylesheet(THEME_STYLESHEETS.get(theme, "dashboard"))
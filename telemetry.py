@@ -0,0 +1,197 @@
+# telemetry.py
+"""Timing spans for the rerun hot paths, aggregated into histograms.
+
+    with span("auth.login"):
+        ...
+
+    @timed("lottie.fetch")
+    def load(...): ...
+
+Every finished span adds its duration to a fixed-bucket histogram for its
+name (process-wide, shared by all sessions) and to the list of spans of the
+rerun running on the current thread, which the debug overlay in app.py
+shows. Histograms are served in Prometheus text format on
+http://<host>:METRICS_PORT/metrics together with the result cache counters.
+
+    METRICS_ENABLED=1   turn spans on (default off: span() hands back one
+                        shared no-op context manager, so a disabled span
+                        costs a function call and nothing else)
+    METRICS_HOST        interface the endpoint binds to (default 127.0.0.1)
+    METRICS_PORT        port for the /metrics endpoint (default 9464, 0 = don't serve)
+"""
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("METRICS_ENABLED", "0") == "1"
+HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+PORT = int(os.environ.get("METRICS_PORT", "9464"))
+
+# Upper bounds in seconds, Prometheus style (+Inf is implicit)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (an overestimate by at most one bucket)."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+        seen = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), counts):
+            seen += n
+            if seen >= q * total:
+                return bound
+        return float("inf")
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+_rerun = threading.local()
+
+
+def histogram(name) -> Histogram:
+    h = _histograms.get(name)
+    if h is None:
+        with _histograms_lock:
+            h = _histograms.setdefault(name, Histogram())
+    return h
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        histogram(self.name).observe(elapsed)
+        spans = getattr(_rerun, "spans", None)
+        if spans is not None:
+            spans.append((self.name, elapsed))
+        return False
+
+
+_NOOP = contextlib.nullcontext()
+
+
+def span(name):
+    """Time the enclosed block under `name` (a no-op unless METRICS_ENABLED=1)."""
+    return _Span(name) if ENABLED else _NOOP
+
+
+def timed(name):
+    """Decorator form of span(); returns fn unchanged when spans are disabled."""
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def begin_rerun():
+    """Start collecting this thread's spans for the debug overlay."""
+    _rerun.spans = [] if ENABLED else None
+
+
+def rerun_spans():
+    """(name, seconds) of every span finished so far in this thread's rerun."""
+    return list(getattr(_rerun, "spans", None) or [])
+
+
+def snapshot():
+    """{name: (count, total seconds, p50, p95)} for every span seen so far."""
+    with _histograms_lock:
+        items = list(_histograms.items())
+    return {name: (h.count, h.sum, h.quantile(0.5), h.quantile(0.95)) for name, h in sorted(items)}
+
+
+# ---------------- Prometheus endpoint ----------------
+def render_prometheus():
+    import result_cache
+
+    lines = [
+        "# HELP app_span_seconds Time spent in instrumented hot paths.",
+        "# TYPE app_span_seconds histogram",
+    ]
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    for name, h in items:
+        with h._lock:
+            counts, total, count = list(h.counts), h.sum, h.count
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f'app_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'app_span_seconds_bucket{{span="{name}",le="+Inf"}} {count}')
+        lines.append(f'app_span_seconds_sum{{span="{name}"}} {total}')
+        lines.append(f'app_span_seconds_count{{span="{name}"}} {count}')
+    for key, value in result_cache.stats().items():
+        kind = "gauge" if key in ("entries", "bytes", "max_bytes") else "counter"
+        suffix = "_total" if kind == "counter" else ""
+        lines.append(f"# TYPE app_result_cache_{key}{suffix} {kind}")
+        lines.append(f"app_result_cache_{key}{suffix} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port=PORT):
+    """Start the /metrics endpoint once per process (no-op if disabled or already running)."""
+    global _server
+    with _server_lock:
+        if _server is not None or not ENABLED or not port:
+            return
+        try:
+            _server = ThreadingHTTPServer((HOST, port), _MetricsHandler)
+        except OSError as e:
+            print(f"❌ Metrics endpoint not started on port {port}:", e)
+            _server = False
+            return
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
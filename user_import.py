@@ -0,0 +1,192 @@
+# user_import.py
+"""Bulk import and export of accounts in the user store.
+
+    python user_import.py import users.csv [--batch-size 5000] [--workers 4] [--rejects rejects.jsonl]
+    python user_import.py export users.jsonl
+
+Files are CSV with a header row or JSONL with one object per line; the
+format follows the extension (.csv, .jsonl / .ndjson) unless --format is
+given, and "-" means stdin / stdout. Each record has an email and either a
+plaintext "password", which is hashed, or a "password_hash" stored as is
+(what export writes, so an export can be imported elsewhere). A
+password_hash must be a complete scrypt$n$r$p$salt$hash record.
+
+Import streams the file in batches. For each batch, emails that already
+have an account, or repeat one earlier in the batch, are set aside first, so
+no time is spent hashing them. Validation and scrypt hashing of the rest run
+on a process pool, and the batch is written in one transaction (one file
+write on the TinyDB backend). Later batches see what earlier ones added, so
+duplicates across the whole file are caught too. Rejected records can be
+written to --rejects as JSONL ({"line", "email", "reason"}).
+
+Export walks the table with a cursor and writes records as it reads them,
+so memory use does not grow with the number of users.
+
+The store is the one the app uses (USER_STORE_BACKEND, USERS_DB_PATH;
+see user_store.py) unless --db names another file. Password cost follows
+PASSWORD_SCRYPT_N / _R / _P as in passwords.py, and imported hashes may
+cost at most PASSWORD_MAX_COST.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import passwords
+from user_store import open_user_store
+
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def _format(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise SystemExit(f"Cannot tell the format of {path!r}, pass --format csv|jsonl")
+    return fmt
+
+
+def read_records(f, fmt):
+    """Yield (line number, record dict or None if unparseable) from an open file."""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        yield line_no, record if isinstance(record, dict) else None
+
+
+def _prepare(record):
+    """Validate one record and hash its password: (email, stored password, None) or (email, None, reason).
+
+    Runs in a pool worker process.
+    """
+    email = record["email"]
+    if not EMAIL_PATTERN.fullmatch(email):
+        return email, None, "invalid email"
+    stored, password = record.get("password_hash"), record.get("password")
+    if stored:
+        # Only complete scrypt records: anything else would be stored as a plaintext password
+        if not isinstance(stored, str) or passwords.parse_hash(stored) is None:
+            return email, None, "invalid password_hash"
+        return email, stored, None
+    if not password or not isinstance(password, str):
+        return email, None, "missing password"
+    # Straight to scrypt: this process has no other users of the app's bounded thread pool
+    return email, passwords.hash_password_direct(password), None
+
+
+def import_users(store, records, batch_size=5000, workers=None, on_reject=None, on_batch=None):
+    """Add (line, record) pairs to store in batches. Returns {"read", "added", "duplicates", "invalid"}."""
+    stats = {"read": 0, "added": 0, "duplicates": 0, "invalid": 0}
+
+    def reject(kind, line_no, email, reason):
+        stats[kind] += 1
+        if on_reject:
+            on_reject({"line": line_no, "email": email, "reason": reason})
+
+    records = iter(records)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                break
+            stats["read"] += len(batch)
+            candidates = {}  # email -> (line, record), first occurrence in the batch
+            for line_no, record in batch:
+                email = (record or {}).get("email")
+                if not isinstance(email, str) or not email.strip():
+                    reject("invalid", line_no, email, "unreadable record" if record is None else "missing email")
+                elif email.strip() in candidates:
+                    reject("duplicates", line_no, email.strip(), "duplicate in file")
+                else:
+                    candidates[email.strip()] = (line_no, dict(record, email=email.strip()))
+            for email in store.existing(candidates):
+                reject("duplicates", candidates.pop(email)[0], email, "already registered")
+
+            lines = [line_no for line_no, _ in candidates.values()]
+            chunksize = max(1, len(candidates) // (4 * (workers or os.cpu_count() or 1)))
+            ready = []
+            for line_no, (email, stored, reason) in zip(
+                lines, pool.map(_prepare, [record for _, record in candidates.values()], chunksize=chunksize)
+            ):
+                if reason:
+                    reject("invalid", line_no, email, reason)
+                else:
+                    ready.append((email, stored))
+            added = store.add_many(ready)
+            stats["added"] += added
+            stats["duplicates"] += len(ready) - added  # signed up while this batch was hashing
+            if on_batch:
+                on_batch(stats)
+    return stats
+
+
+def export_users(store, f, fmt):
+    """Write every account to an open file as it is read. Returns the number written."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(["email", "password_hash"])
+        for user in store.iter_users():
+            writer.writerow([user["email"], user["password"]])
+            count += 1
+        return count
+    for user in store.iter_users():
+        f.write(json.dumps({"email": user["email"], "password_hash": user["password"]}) + "\n")
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("import", "export"):
+        p = sub.add_parser(name)
+        p.add_argument("file", help='CSV or JSONL file, "-" for stdin/stdout')
+        p.add_argument("--format", choices=["csv", "jsonl"])
+        p.add_argument("--db", help="user store file (default: USERS_DB_PATH or the backend's default)")
+        if name == "import":
+            p.add_argument("--batch-size", type=int, default=5000)
+            p.add_argument("--workers", type=int, help="hashing processes (default: CPU count)")
+            p.add_argument("--rejects", help="write rejected records here as JSONL")
+    args = parser.parse_args()
+    fmt = args.format or ("jsonl" if args.file == "-" else _format(args.file))
+    store = open_user_store(path=args.db)
+
+    if args.command == "export":
+        f = sys.stdout if args.file == "-" else open(args.file, "w", newline="")
+        with f:
+            count = export_users(store, f, fmt)
+        print(f"Exported {count} users", file=sys.stderr)
+        return
+
+    f = sys.stdin if args.file == "-" else open(args.file, newline="")
+    rejects = open(args.rejects, "w") if args.rejects else None
+    try:
+        stats = import_users(
+            store, read_records(f, fmt), args.batch_size, args.workers,
+            on_reject=rejects and (lambda r: rejects.write(json.dumps(r) + "\n")),
+            on_batch=lambda s: print(f"{s['read']} read, {s['added']} added", file=sys.stderr),
+        )
+    finally:
+        f.close()
+        if rejects:
+            rejects.close()
+    print(f"Imported {stats['added']} of {stats['read']} users: "
+          f"{stats['duplicates']} duplicates, {stats['invalid']} invalid", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# user_store.py
+"""Pluggable storage backends for the users table.
+
+auth_module only talks to the small interface below (get / add /
+set_password / iter_users), so the backend can be swapped without touching
+signup() or login(). Bulk imports (user_import.py) also use existing /
+add_many, which write a whole batch at once:
+
+    USER_STORE_BACKEND=sqlite  (default) SQLite in WAL mode, one row per user
+    USER_STORE_BACKEND=tinydb  the original users.json file
+
+The first time the SQLite store is opened next to an existing users.json it
+copies those users over, so switching backends does not lose accounts.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
+
+LEGACY_JSON_PATH = "users.json"
+
+
+class WriteThroughCache(CachingMiddleware):
+    """Serve reads from memory but flush every write straight to disk."""
+    WRITE_CACHE_SIZE = 1
+
+
+# ---------------- TinyDB ----------------
+class TinyDBUserStore:
+    """users.json behind TinyDB, with an in-memory email -> doc_id index.
+
+    Every write still rewrites the whole file and nothing locks it, so this
+    backend is only safe for a single process.
+    """
+
+    def __init__(self, path=LEGACY_JSON_PATH):
+        self.db = TinyDB(path, storage=WriteThroughCache(JSONStorage))
+        self.table = self.db.table("users")
+        # email -> doc_id, built once on open and kept up to date by every
+        # write below, so lookups never have to scan the whole table.
+        self._email_index = {doc["email"]: doc.doc_id for doc in self.table.all()}
+
+    def get(self, email):
+        doc_id = self._email_index.get(email)
+        if doc_id is None:
+            return None
+        return dict(self.table.get(doc_id=doc_id))
+
+    def add(self, email, password):
+        if email in self._email_index:
+            return False
+        self._email_index[email] = self.table.insert({"email": email, "password": password})
+        return True
+
+    def existing(self, emails):
+        """The subset of emails that already have an account."""
+        return {email for email in emails if email in self._email_index}
+
+    def add_many(self, users):
+        """Insert (email, password) pairs with one file write, skipping known emails. Returns the number added."""
+        new = {}
+        for email, password in users:
+            if email not in self._email_index:
+                new.setdefault(email, password)
+        doc_ids = self.table.insert_multiple({"email": e, "password": p} for e, p in new.items())
+        self._email_index.update(zip(new, doc_ids))
+        return len(new)
+
+    def set_password(self, email, password):
+        doc_id = self._email_index.get(email)
+        if doc_id is None:
+            return False
+        self.table.update({"password": password}, doc_ids=[doc_id])
+        return True
+
+    def iter_users(self):
+        for doc in self.table.all():
+            yield dict(doc)
+
+    def __len__(self):
+        return len(self._email_index)
+
+
+# ---------------- SQLite ----------------
+class SQLiteUserStore:
+    """Users in a SQLite file in WAL mode.
+
+    A signup is a single-row INSERT, readers never block the writer, and any
+    number of Streamlit worker processes can share the same file. Connections
+    are per thread because Streamlit runs each session on its own thread.
+    """
+
+    def __init__(self, path="users.db"):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            " email TEXT PRIMARY KEY,"
+            " password TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get(self, email):
+        row = self._conn().execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def add(self, email, password):
+        cur = self._conn().execute(
+            "INSERT OR IGNORE INTO users (email, password) VALUES (?, ?)", (email, password)
+        )
+        return cur.rowcount == 1
+
+    def existing(self, emails):
+        """The subset of emails that already have an account."""
+        emails, found = list(emails), set()
+        for i in range(0, len(emails), 500):  # stay under SQLite's bound-parameter limit
+            chunk = emails[i:i + 500]
+            rows = self._conn().execute(
+                f"SELECT email FROM users WHERE email IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def add_many(self, users):
+        """Insert (email, password) pairs in one transaction, skipping known emails. Returns the number added."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO users (email, password) VALUES (?, ?)", users)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return conn.total_changes - before
+
+    def set_password(self, email, password):
+        cur = self._conn().execute("UPDATE users SET password = ? WHERE email = ?", (password, email))
+        return cur.rowcount == 1
+
+    def iter_users(self):
+        for row in self._conn().execute("SELECT * FROM users ORDER BY email"):
+            yield dict(row)
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def migrate_from_json(self, json_path=LEGACY_JSON_PATH):
+        """Copy users from a TinyDB users.json once. Returns the number of rows added.
+
+        Runs in one IMMEDIATE transaction and records itself in the meta table,
+        so concurrent workers starting together migrate exactly once.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        key = "migrated:" + os.path.abspath(json_path)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                conn.execute("ROLLBACK")
+                return 0
+            with open(json_path) as f:
+                docs = json.load(f).get("users", {}).values()
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (email, password) VALUES (?, ?)",
+                ((doc["email"], doc["password"]) for doc in docs),
+            )
+            added = conn.total_changes - before
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(added)))
+            conn.execute("COMMIT")
+            return added
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def open_user_store(backend=None, path=None):
+    """Open the configured user store (see module docstring)."""
+    backend = backend or os.environ.get("USER_STORE_BACKEND", "sqlite")
+    path = path or os.environ.get("USERS_DB_PATH")
+    if backend == "tinydb":
+        return TinyDBUserStore(path or LEGACY_JSON_PATH)
+    if backend == "sqlite":
+        store = SQLiteUserStore(path or "users.db")
+        store.migrate_from_json(os.environ.get("LEGACY_USERS_JSON", LEGACY_JSON_PATH))
+        return store
+    raise ValueError(f"Unknown USER_STORE_BACKEND: {backend!r}")
+
+
+if __name__ == "__main__":
+    # One-off migration: python user_store.py [users.json] [users.db]
+    json_path = sys.argv[1] if len(sys.argv) > 1 else LEGACY_JSON_PATH
+    db_path = sys.argv[2] if len(sys.argv) > 2 else "users.db"
+    added = SQLiteUserStore(db_path).migrate_from_json(json_path)
+    print(f"Migrated {added} users from {json_path} to {db_path}")
@@ -0,0 +1,46 @@
+# views/__init__.py
+"""The logged-in pages, one module each, imported on a page's first visit.
+
+Every page's render() is an st.fragment: a widget on the page reruns that
+page only, while the sidebar, theme and session handling in app.py run
+again on navigation. The Dashboard's sections are fragments of their own
+(dashboard_views.py), so a chart control reruns just its chart.
+"""
+import functools
+import importlib
+
+import streamlit as st
+
+from telemetry import span
+
+PAGES = {
+    "Home": "home",
+    "Dashboard": "dashboard",
+    "Insights": "insights",
+    "Profile": "profile",
+    "Feedback": "feedback",
+}
+
+
+def centered_layout(content_func):
+    """Reusable wrapper to center page content"""
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        content_func()
+
+
+def page_fragment(name):
+    """Decorator for a page's render(): run it as a fragment, timed as the page.<name> span."""
+    def decorator(fn):
+        @st.fragment
+        @functools.wraps(fn)
+        def render():
+            with span(f"page.{name}"):
+                fn()
+        return render
+    return decorator
+
+
+def render(page):
+    """Draw `page`, importing its module the first time it is visited."""
+    importlib.import_module(f"views.{PAGES[page]}").render()
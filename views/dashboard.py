@@ -0,0 +1,62 @@
+# views/dashboard.py
+import time
+
+import streamlit as st
+
+from assets import image_source
+from dashboard_snapshots import INTERVAL as SNAPSHOT_INTERVAL, format_age, load_snapshots, start_snapshot_job
+from dashboard_views import render_choropleth, render_country_metrics, render_group_comparison, render_trajectories
+from views import page_fragment
+
+
+@st.fragment(run_every=60)
+def render_snapshots():
+    """Pre-rendered charts (dashboard_snapshots.py); rerun every minute to keep their ages current."""
+    now = time.time()
+    schedule = f", refreshed every {SNAPSHOT_INTERVAL / 60:.0f} min" if SNAPSHOT_INTERVAL > 0 else ""
+    for snapshot in load_snapshots():
+        st.subheader(snapshot["title"])
+        st.vega_lite_chart(spec=snapshot["spec"])
+        st.caption(f"{snapshot['caption']} · snapshot taken {format_age(now - snapshot['taken_at'])}{schedule}")
+
+
+@page_fragment("Dashboard")
+def render():
+    # Started by the first Dashboard visit, so other pages never load what the job renders with
+    start_snapshot_job()
+    # Heading (centered)
+    st.markdown(
+        "<h1 style='text-align:center; font-size:45px;'>📊 Dashboard</h1>",
+        unsafe_allow_html=True
+    )
+    # Centered GIF using columns
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.image(
+            image_source("dashboard_hero"),
+            use_container_width=True  # updated parameter
+        )
+    # ---------------- Left-aligned content ----------------
+    st.subheader("Power BI Dashboard Overview")
+    powerbi_url = "https://app.powerbi.com/view?r=eyJrIjoiOGE0ZWJlOWUtYjYxNS00Mzc1LTg2ODktMjA0YjNhNzQxNTFiIiwidCI6ImRiYTUxZDMwLTA2MGMtNDVhNC1hOTUyLTUyMWU4YWQ1OWE2OCJ9"
+
+    # The remote report is slow to load, so nothing waits for it unless asked
+    if st.toggle("Load the interactive Power BI dashboard", key="dashboard_powerbi"):
+        st.markdown(f"""
+            <div class="powerbi-container">
+                <iframe title="PowerBI Dashboard"
+                    width="100%" height="700"
+                    src="{powerbi_url}"
+                    frameborder="0" allowFullScreen="true"></iframe>
+            </div>
+        """, unsafe_allow_html=True)
+    # ---------------- Native metrics (local dataset) ----------------
+    # Snapshots first when there are any; the live charts are built on request
+    if load_snapshots() and not st.toggle("Interactive charts", key="dashboard_live"):
+        render_snapshots()
+    else:
+        # Each section is a fragment of its own: a chart control reruns only its chart
+        render_choropleth()
+        render_group_comparison()
+        render_trajectories()
+        render_country_metrics()
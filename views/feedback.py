@@ -0,0 +1,45 @@
+# views/feedback.py
+import streamlit as st
+
+from auth_module import session_user
+from views import centered_layout, page_fragment
+
+
+@page_fragment("Feedback")
+def render():
+    def feedback_content():
+        st.markdown(
+            "<h1 style='text-align:center; font-size:36px;'>💬 Feedback</h1>",
+            unsafe_allow_html=True
+        )
+        st.markdown(
+            """
+            <div style="
+                display: flex;
+                flex-direction: column;
+                align-items: center;
+                justify-content: center;
+                gap: 15px;
+                width: 60%;
+                font-size:28px;
+                margin: auto;
+            ">
+            """,
+            unsafe_allow_html=True
+        )
+        # Feedback text area
+        feedback = st.text_area("Enter your feedback here:", height=150, key="feedback_text")
+        # Submit button
+        if st.button("Submit Feedback", key="submit_feedback_btn"):
+            from engagement import record
+            from feedback_store import get_feedback_sink
+            if not feedback.strip():
+                st.error("Please enter some feedback")
+            # Buffered and written to disk in batches by a background thread (feedback_store.py)
+            elif get_feedback_sink().submit(session_user(st.session_state.session_token), feedback.strip()):
+                record("feedback", session_user(st.session_state.session_token) or "anonymous")
+                st.success("✅ Thanks for your feedback!")
+            else:
+                st.error("Feedback is busy right now, please try again in a moment.")
+        st.markdown("</div>", unsafe_allow_html=True)
+    centered_layout(feedback_content)
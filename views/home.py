@@ -0,0 +1,95 @@
+# views/home.py
+import streamlit as st
+
+from lottie_cache import get_lottie, LottieFetchError
+from telemetry import timed
+from views import centered_layout, page_fragment
+
+HOME_LOTTIE_URL = "https://assets9.lottiefiles.com/packages/lf20_jcikwtux.json"
+
+
+@timed("lottie.load")
+def load_lottieurl(url: str):
+    """Animation JSON from the shared process-wide cache (see lottie_cache.py)"""
+    try:
+        return get_lottie(url)
+    except LottieFetchError as e:
+        st.warning(f"Error loading Lottie animation: {e}")
+        return {}
+
+
+@page_fragment("Home")
+def render():
+    def home_content():
+        st.markdown(
+            "<h1 style='text-align: center; font-size: 45px;'>🏠 Project Insights & Analysis</h1>",
+            unsafe_allow_html=True,
+        )
+        # Animation
+        lottie_home = load_lottieurl(HOME_LOTTIE_URL)
+        from streamlit_lottie import st_lottie  # not until the page is drawn: views.home is imported by app.py
+        st_lottie(lottie_home, speed=1, width=900, height=350, key="home_animation")
+        # Description (centered and larger text)
+        st.markdown(
+            "<h2 style='font-size: 28px;'>📌 Project Description</h2>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            "<p style='font-size: 20px; line-height: 1.6;'>"
+            "This project is a <b>Streamlit-based Login and Signup System</b> with a modern UI. "
+            "It integrates interactive dashboards, insights visualization, and AI chatbot support. "
+            "The application is designed to provide a seamless and engaging experience for users."
+            "</p>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            "<h2 style='font-size:28 px;'>📊 Dashboard Overview</h2>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            "<p style='font-size: 20px; line-height: 1.6;'>"
+            "This interactive Power BI dashboard provides a comprehensive visualization of key metrics and insights, enabling users to explore trends, patterns, and performance at a glance. "
+            "Designed for clarity and interactivity, it helps in making data-driven decisions efficiently."
+            "</p>",
+            unsafe_allow_html=True
+        )
+        st.markdown(
+            "<h2 style='font-size:28 px;'>🎯 Objectives</h2>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            "<p style='font-size: 20px; line-height: 1.6;'>"
+            "1. Develop a web app with a clean UI for user management. <br>" 
+            "2. Ensure persistent storage of user data using TinyDB. <br>"  
+            "3. Integrate Power BI dashboards for analytics. <br>"
+            "4. Collect and manage user feedback effectively."
+            "</p>",
+            unsafe_allow_html=True
+        )
+        st.markdown(
+            "<h2 style='font-size:28 px;'>✨ Key Features</h2>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            "<p style='font-size: 20px; line-height: 1.6;'>"
+            "🟢 Signup and Login with validation. <br>"
+            "🟢 Interactive sidebar navigation. <br>"
+            "🟢 Embedded Power BI dashboards for real-time insights. <br>"
+            "🟢 Feedback collection form. <br>"
+            "🟢 Responsive and modern design. "
+            "</p>",
+            unsafe_allow_html=True
+        )
+        st.markdown(
+            "<h2 style='font-size:28 px;'>💡 Insights</h2>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            "<p style='font-size: 20px; line-height: 1.6;'>"
+            "➡️ User registrations are steadily increasing each month. <br>"
+            "➡️ Feedback shows growing engagement and interaction. <br>"
+            "➡️ The system can be extended for role-based dashboards in future. "
+            "</p>",
+            unsafe_allow_html=True
+        )
+    centered_layout(home_content)
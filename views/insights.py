@@ -0,0 +1,65 @@
+# views/insights.py
+import streamlit as st
+
+from engagement import get_engagement_store, summary
+from views import centered_layout, page_fragment
+
+
+@page_fragment("Insights")
+def render():
+    def insights_content():
+        # Title with bigger font
+        st.markdown(
+            "<h1 style='text-align:center; font-size:45px;'>📈 Insights & Key Learnings</h1>",
+            unsafe_allow_html=True
+        )
+        # Precomputed day/month counters only, never the event log (engagement.py)
+        stats = summary(get_engagement_store())
+        # 🚀 User Engagement Trends
+        st.markdown("<h2 style='font-size:28px;'>🚀 User Engagement Trends</h2>", unsafe_allow_html=True)
+        st.line_chart(
+            {"Daily active users": stats["daily_active"], "Sign-ups": stats["daily_signups"]},
+            x=None, height=250,
+        )
+        st.caption(f"Last {len(stats['days'])} days, {stats['days'][0]} to {stats['days'][-1]} (UTC)")
+        # 📊 Dashboard Utilization
+        st.markdown("<h2 style='font-size:28px;'>📊 Dashboard Utilization</h2>", unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Monthly Active Users", stats["mau"], stats["mau"] - stats["prev_mau"])
+        col2.metric("Sign-ups this month", stats["signups"], stats["signups"] - stats["prev_signups"])
+        col3.metric("Feedback this month", stats["feedback"])
+        # 🎯 Business Insights
+        st.markdown("<h2 style='font-size:28px;'>🎯 Business Insights</h2>", unsafe_allow_html=True)
+        if stats["returning_ratio"] is None:
+            retention = "No logins yet this month."
+        else:
+            retention = (
+                f"<b>Returning user ratio</b> is {stats['returning_ratio']:.0%}: "
+                "the share of this month's active users who were also active last month."
+            )
+        trend = "up" if stats["mau"] >= stats["prev_mau"] else "down"
+        st.markdown(
+            f"""
+            <ul style='font-size:20px; line-height:1.8;'>
+                <li>{retention}</li>
+                <li><b>Monthly active users</b> are {trend} from {stats['prev_mau']} last month to {stats['mau']}.</li>
+                <li><b>Sign-ups</b>: {stats['signups']} this month, {stats['prev_signups']} last month.</li>
+            </ul>
+            """,
+            unsafe_allow_html=True
+        )
+        # ✨ Recommendations
+        st.markdown("<h2 style='font-size:28px;'>✨ Recommendations</h2>", unsafe_allow_html=True)
+        st.markdown(
+            """
+            <ol style='font-size:20px; line-height:1.8;'>
+                <li>Strengthen onboarding with guided walkthroughs</li>
+                <li>Enhance dashboard performance to reduce load time</li>
+                <li>Introduce role-based dashboards</li>
+                <li>Encourage feedback loops for evolving user needs</li>
+            </ol>
+            """,
+            unsafe_allow_html=True
+        )
+    # Wrap into center layout
+    centered_layout(insights_content)
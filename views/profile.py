@@ -0,0 +1,59 @@
+# views/profile.py
+import streamlit as st
+
+from views import centered_layout, page_fragment
+
+
+@page_fragment("Profile")
+def render():
+    # Personal Information (centered in a card)
+    def profile_info_content():
+        st.markdown(
+            "<h1 style='text-align:center; font-size:36px;'>👤 Profile</h1>",
+            unsafe_allow_html=True
+        )
+        st.markdown(
+            """
+            <div style="
+                background-color: #595959;
+                padding: 25px;
+                border-radius: 15px;
+                box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+                text-align: center;
+                width: 80%;
+                margin: auto;
+                margin-bottom: 30px;
+            ">
+                <h2 style="font-size:26px; margin-bottom:15px;">Personal Information</h2>
+                <p style="font-size:20px; line-height:1.8; margin:0;">
+                    <b>Name:</b> Mohammad Ashee <br>
+                    <b>Username:</b> Ashee_Md <br>
+                    <b>Email:</b> asheemohammad123@gmail.com <br>
+                </p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+    centered_layout(profile_info_content)  # 👈 Profile card centered
+
+    # Update Profile Section (centered but no card)
+    def update_profile_content():
+        st.markdown("<h2 style='text-align:center; font-size:36px; margin-top:30px;'>Update Profile Information</h2>", unsafe_allow_html=True)
+
+        with st.form("update_profile_form"):
+            st.markdown(
+                """
+                <div style="display:flex; justify-content:center; flex-direction:column; align-items:center; gap:10px; width:100%;">
+                """,
+                unsafe_allow_html=True
+            )
+
+            new_name = st.text_input("Full Name", key="update_name", max_chars=50, help="Enter your full name")
+            new_username = st.text_input("Username", key="update_username", max_chars=30, help="Enter your username")
+            new_email = st.text_input("Email", key="update_email", max_chars=50, help="Enter your email")
+            submitted = st.form_submit_button("Update Profile")
+            if submitted:
+                st.success("✅ Profile updated successfully!")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    centered_layout(update_profile_content)  # Form centered cleanly